@@ -0,0 +1,143 @@
+"""
+Headless batch generation of SUDOKU puzzles.
+  * generate_many spreads generation over a pool of worker processes and yields each puzzle
+    and its solution as soon as its batch is finished, in completion order.
+  * Only a bounded number of batches are in flight at once, so memory use does not grow with n.
+  * Boards are written as size * size character strings, row by row, with 0 for an empty cell,
+    81 characters for a 9 * 9 board. Digits above 9 are written as letters, A for 10.
+
+Usage:
+    python batchGenerator.py 100000 --workers 8 --seed 1 --output puzzles.txt
+    python batchGenerator.py 100 --box-size 4 --output puzzles16.txt
+    python batchGenerator.py 1000 --difficulty hard --output hard.txt
+    python batchGenerator.py 1000 --index seen.idx --output new.txt
+    python batchGenerator.py 1000000 --archive --output puzzles.sdka
+"""
+
+# import sudoku board class to generate each puzzle
+from sudokuBoardClass import SudokuBoard
+from puzzleIndexClass import PuzzleIndex
+from puzzleArchiveClass import PuzzleArchiveWriter
+from techniqueSolverClass import TechniqueSolver
+
+# import libraries for the worker pool and command line interface
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import argparse, os, random, sys
+
+
+"""
+generate a single puzzle, the seed fixes both the filled board and the clue removal order
+  * difficulty ("easy", "medium", "hard" or "expert") generates a puzzle graded at that difficulty
+"""
+def generate_puzzle(seed, strategy="mrv", backend="bitmask", box_size=3, difficulty=None):
+    board = SudokuBoard(strategy, backend, box_size)
+    board.generate(seed, difficulty)
+
+    return board.fresh_board.to_string(), board.solved_board.to_string()
+
+
+"""generate a batch of puzzles in a worker process, one for each seed"""
+def generate_batch(seeds, strategy="mrv", backend="bitmask", box_size=3, difficulty=None):
+    return [generate_puzzle(seed, strategy, backend, box_size, difficulty) for seed in seeds]
+
+
+"""
+yield n (puzzle, solution) string pairs as they are generated
+  * workers is the number of processes, None uses every core and 1 generates in this process
+  * seed makes the set of puzzles reproducible, puzzle i is generated from seed + i
+  * batch_size puzzles are sent to a worker at a time to keep inter-process overhead low
+  * box_size sets the board size, 3 for 9 * 9 and 4 for 16 * 16
+  * difficulty generates puzzles graded at that difficulty, any difficulty by default
+"""
+def generate_many(n, workers=None, seed=None, strategy="mrv", backend="bitmask", batch_size=16, box_size=3,
+                  difficulty=None):
+    # pick a random base seed so every worker generates different puzzles
+    if seed == None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+
+    # generate in this process without a pool
+    if workers == 1:
+        for i in range(n):
+            yield generate_puzzle(seed + i, strategy, backend, box_size, difficulty)
+        return
+
+    workers = workers or os.cpu_count() or 1
+
+    # split the seeds into batches, created lazily as batches are submitted
+    batches = (range(seed + start, seed + min(start + batch_size, n)) for start in range(0, n, batch_size))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        # keep a few batches queued per worker so no worker waits for work
+        for batch in batches:
+            pending.add(pool.submit(generate_batch, batch, strategy, backend, box_size, difficulty))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            # top up the queue before handing results back
+            for _ in done:
+                batch = next(batches, None)
+                if batch != None:
+                    pending.add(pool.submit(generate_batch, batch, strategy, backend, box_size, difficulty))
+
+            for future in done:
+                for puzzle in future.result():
+                    yield puzzle
+
+
+"""command line interface, writes one "puzzle,solution" line per puzzle or a binary puzzle archive"""
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Generate unique solution SUDOKU puzzles in parallel.")
+    parser.add_argument("count", type=int, help="number of puzzles to generate")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to every core")
+    parser.add_argument("--seed", type=int, default=None, help="base seed for reproducible puzzles")
+    parser.add_argument("--strategy", default="mrv", choices=["ordered", "mrv"], help="search strategy")
+    parser.add_argument("--backend", default="bitmask", choices=["bitmask", "dlx"], help="solver backend")
+    parser.add_argument("--batch-size", type=int, default=16, help="puzzles sent to a worker at a time")
+    parser.add_argument("--box-size", type=int, default=3, choices=[2, 3, 4, 5],
+                        help="sub-grid size, 3 for 9 * 9 boards and 4 for 16 * 16")
+    parser.add_argument("--difficulty", default=None, choices=["easy", "medium", "hard", "expert"],
+                        help="difficulty of the puzzles, any difficulty by default")
+    parser.add_argument("--index", default=None,
+                        help="puzzle index file, puzzles equivalent to one in it are skipped and new ones added")
+    parser.add_argument("--archive", action="store_true", help="write the output file as a binary puzzle archive")
+    parser.add_argument("--output", default=None, help="output file, defaults to standard output")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.archive and not arguments.output:
+        parser.error("--archive needs an --output file")
+    if arguments.difficulty != None \
+            and arguments.difficulty not in TechniqueSolver.difficulties_for(arguments.box_size):
+        parser.error(f'--box-size {arguments.box_size} puzzles are never "{arguments.difficulty}"')
+
+    if arguments.archive:
+        settings = {"seed": arguments.seed, "strategy": arguments.strategy, "backend": arguments.backend}
+        output = PuzzleArchiveWriter(arguments.output, arguments.box_size, arguments.difficulty, settings)
+    else:
+        output = open(arguments.output, "w") if arguments.output else sys.stdout
+    index = PuzzleIndex(arguments.index) if arguments.index else None
+    try:
+        for puzzle, solution in generate_many(arguments.count, arguments.workers, arguments.seed,
+                                              arguments.strategy, arguments.backend, arguments.batch_size,
+                                              arguments.box_size, arguments.difficulty):
+            # skip a puzzle that is a relabeled, reordered or transposed copy of one already generated
+            if index != None and not index.add(puzzle):
+                continue
+
+            if arguments.archive:
+                output.add(puzzle, solution)
+            else:
+                output.write(f'{puzzle},{solution}\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if index != None:
+            index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Vectorized validation of many SUDOKU boards at once.
+  * Boards are an (N, size, size) integer array with 0 for an empty cell, size is 9 for standard
+    boards and any square (4, 16, 25) for other box sizes.
+  * Digits are turned into bitmasks and every unit of every board is checked with whole-array
+    NumPy operations, there is no Python loop over boards or cells.
+
+Requires numpy.
+"""
+
+# import numpy for vectorized array operations
+import numpy as np
+
+# bitmask of each cell value, bit d for digit d and no bit for an empty cell, up to 25 * 25 boards
+_DIGIT_BITS = np.array([0] + [1 << digit for digit in range(1, 26)], dtype=np.uint32)
+
+# value of each board string character, letters are the digits above 9
+_SYMBOL_VALUES = np.zeros(128, dtype=np.uint8)
+_SYMBOL_VALUES[np.frombuffer(b"0123456789ABCDEFGHIJKLMNOP", dtype=np.uint8)] = np.arange(26)
+_SYMBOL_VALUES[np.frombuffer(b"abcdefghijklmnop", dtype=np.uint8)] = np.arange(10, 26)
+
+"""convert a list of board strings (0 or . for empty) of the same size into an (N, size, size) array"""
+def boards_from_strings(strings):
+    text = "".join(strings).encode("ascii")
+    boards = _SYMBOL_VALUES[np.frombuffer(text, dtype=np.uint8)]
+
+    size = int(round(len(strings[0]) ** 0.5)) if len(strings) else 9
+    return boards.reshape(-1, size, size)
+
+
+"""bitmask of the digits seen more than once in each unit, for an array of units of size cell bitmasks"""
+def _repeated_digits(units):
+    seen = np.zeros(units.shape[:-1], dtype=np.uint32)
+    repeated = np.zeros(units.shape[:-1], dtype=np.uint32)
+
+    # loop over the cell positions, every unit of every board is handled at once
+    for k in range(units.shape[-1]):
+        repeated |= seen & units[..., k]
+        seen |= units[..., k]
+
+    return repeated
+
+
+"""
+validate an (N, size, size) array of complete or partial boards, size being 4, 9, 16 or 25
+  * returns (valid, complete, conflicts):
+      valid     - (N,) bool, no digit repeats in a row, column or sub-grid and every value is 0 to size
+      complete  - (N,) bool, no cell is empty
+      conflicts - (N, size, size) bool, cells holding a digit repeated in their row, column or sub-grid,
+                  or a value outside 0 to size
+  * a board that is both valid and complete is solved
+"""
+def validate_boards(boards):
+    boards = np.asarray(boards)
+    if boards.ndim == 2:
+        boards = boards[np.newaxis]
+
+    size = boards.shape[-1]
+    box_size = int(round(size ** 0.5))
+
+    # values outside 0 to size always conflict
+    out_of_range = (boards < 0) | (boards > size)
+
+    # bit d is set for digit d, empty and out of range cells have no bit
+    bits = np.where(out_of_range, 0, _DIGIT_BITS[boards.clip(0, size)]).astype(np.uint32)
+
+    # digits repeated in each row, column and sub-grid
+    repeated_rows = _repeated_digits(bits)
+    repeated_columns = _repeated_digits(bits.transpose(0, 2, 1))
+    boxes = bits.reshape(-1, box_size, box_size, box_size, box_size).transpose(0, 1, 3, 2, 4) \
+                .reshape(-1, box_size, box_size, size)
+    repeated_boxes = _repeated_digits(boxes)
+
+    # spread the repeated digits of every unit back over its cells
+    repeated = repeated_rows[:, :, np.newaxis] \
+               | repeated_columns[:, np.newaxis, :] \
+               | repeated_boxes.repeat(box_size, axis=1).repeat(box_size, axis=2)
+
+    # a cell conflicts when the digit it holds is repeated in one of its units
+    conflicts = ((bits & repeated) != 0) | out_of_range
+
+    valid = ~conflicts.any(axis=(1, 2))
+    complete = (boards != 0).all(axis=(1, 2))
+
+    return valid, complete, conflicts
@@ -0,0 +1,218 @@
+"""
+Reproducible benchmarks for generating, solving and checking SUDOKU puzzles.
+  * Every puzzle is generated from a fixed seed and the shared random generator is seeded too,
+    so two runs do the same work and only the machine and the code change the timings.
+  * Each benchmark is timed at least repeat times, and until its runs add up to MIN_SECONDS, and the
+    fastest run is kept, then run once more under tracemalloc to record its peak memory. A single
+    run of a short benchmark is too noisy to compare with a baseline.
+  * Solving and uniqueness checks run on the puzzle fixtures in fixtures/, 17 clue puzzles and
+    well-known hard puzzles.
+  * Results are written as JSON. --baseline compares them with an earlier result file and exits
+    with status 1 when a benchmark is slower by more than --tolerance.
+
+Usage:
+    python benchmark.py --output bench.json
+    python benchmark.py --quick --baseline bench.json
+"""
+
+# import sudoku board class and puzzle generator to benchmark
+from sudokuBoardClass import SudokuBoard
+from compactBoardClass import CompactBoard
+from batchGenerator import generate_puzzle
+
+# import libraries for timing, memory tracing and the command line interface
+import argparse, json, os, platform, random, sys, time, tracemalloc
+
+# folder holding the puzzle fixtures
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# least total seconds of the timed runs of a benchmark, short benchmarks are run more times to reach it
+MIN_SECONDS = 0.5
+
+# solver backend and search strategy pairs benchmarked, the ordered search is too slow for 17 clue puzzles
+SOLVERS = [("bitmask", "mrv"), ("dlx", "mrv")]
+GENERATORS = [("bitmask", "ordered"), ("bitmask", "mrv"), ("dlx", "mrv")]
+
+
+"""read the puzzles of a fixture file, one puzzle string per line, skipping blank lines and # comments"""
+def load_puzzles(path):
+    with open(path) as fixture:
+        return [line.strip() for line in fixture if line.strip() and not line.startswith("#")]
+
+
+"""
+time function at least repeat times and until the runs add up to min_seconds, then trace the memory
+of one more run
+  * returns the seconds of the fastest run, the peak memory in bytes and the value of the last run
+"""
+def measure(function, repeat, min_seconds=MIN_SECONDS):
+    best = None
+    runs = 0
+    total = 0
+    while runs < repeat or total < min_seconds:
+        start = time.perf_counter()
+        value = function()
+        seconds = time.perf_counter() - start
+        best = seconds if best == None else min(best, seconds)
+        runs += 1
+        total += seconds
+
+    # tracing slows the run down, so it's kept apart from the timed runs
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return best, peak, value
+
+
+"""result record of one benchmark, count items done in seconds"""
+def result(name, count, seconds, peak, nodes=None):
+    record = {"name": name,
+              "count": count,
+              "seconds": round(seconds, 6),
+              "seconds_per_item": round(seconds / count, 9),
+              "per_second": round(count / seconds, 3),
+              "peak_memory_bytes": peak}
+    if nodes != None:
+        record["nodes_per_item"] = round(nodes / count, 3)
+
+    return record
+
+
+"""time per generated puzzle, puzzle i is generated from seed + i"""
+def bench_generation(count, seed, repeat, backend, strategy, box_size=3):
+    def run():
+        # every run searches from scratch, not from the checks of the run before
+        SudokuBoard.uniqueness_memo.clear()
+
+        random.seed(seed)
+        return [generate_puzzle(seed + i, strategy, backend, box_size) for i in range(count)]
+
+    seconds, peak, _ = measure(run, repeat)
+    size = box_size * box_size
+
+    return result(f'generate/{backend}/{strategy}/{size}x{size}', count, seconds, peak)
+
+
+"""solves per second over a list of puzzle strings, every solution is checked"""
+def bench_solving(name, puzzles, repeat, backend, strategy):
+    def run():
+        nodes = 0
+        for puzzle in puzzles:
+            board = SudokuBoard(strategy, backend)
+            board.player_board = CompactBoard.from_string(puzzle)
+            if not board.solve():
+                raise RuntimeError(f'{backend}/{strategy} found no solution for {puzzle}')
+            nodes += board.nodes
+
+        return nodes
+
+    seconds, peak, nodes = measure(run, repeat)
+
+    return result(f'solve/{name}/{backend}/{strategy}', len(puzzles), seconds, peak, nodes)
+
+
+"""uniqueness checks per second over a list of puzzle strings, counting solutions up to 2"""
+def bench_uniqueness(name, puzzles, repeat, backend, strategy):
+    def run():
+        nodes = 0
+        for puzzle in puzzles:
+            board = SudokuBoard(strategy, backend)
+            board.player_board = CompactBoard.from_string(puzzle)
+            if board.count_solutions(limit=2) != 1:
+                raise RuntimeError(f'{backend}/{strategy} found more than one solution for {puzzle}')
+            nodes += board.nodes
+
+        return nodes
+
+    seconds, peak, nodes = measure(run, repeat)
+
+    return result(f'unique/{name}/{backend}/{strategy}', len(puzzles), seconds, peak, nodes)
+
+
+"""
+run every benchmark and return the results as a JSON ready dict
+  * quick generates fewer puzzles, for a fast check before committing, every benchmark is still
+    timed repeat times or more and the fastest run kept
+"""
+def run_benchmarks(seed=0, repeat=3, quick=False):
+    count = 10 if quick else 50
+
+    fixtures = {"17_clue": load_puzzles(os.path.join(FIXTURES, "puzzles_17_clue.txt")),
+                "hard": load_puzzles(os.path.join(FIXTURES, "puzzles_hard.txt"))}
+
+    # generated puzzles used for the uniqueness checks
+    random.seed(seed)
+    generated = [generate_puzzle(seed + i)[0] for i in range(count)]
+
+    benchmarks = []
+    for backend, strategy in GENERATORS:
+        benchmarks.append(bench_generation(count, seed, repeat, backend, strategy))
+    benchmarks.append(bench_generation(max(count // 10, 1), seed, repeat, "bitmask", "mrv", box_size=4))
+
+    for name, puzzles in fixtures.items():
+        for backend, strategy in SOLVERS:
+            benchmarks.append(bench_solving(name, puzzles, repeat, backend, strategy))
+
+    for name, puzzles in list(fixtures.items()) + [("generated", generated)]:
+        for backend, strategy in SOLVERS:
+            benchmarks.append(bench_uniqueness(name, puzzles, repeat, backend, strategy))
+
+    return {"seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "benchmarks": benchmarks}
+
+
+"""list the benchmarks slower than in baseline by more than tolerance, a fraction of the baseline rate"""
+def compare(results, baseline, tolerance=0.2):
+    rates = {record["name"]: record["per_second"] for record in baseline["benchmarks"]}
+
+    regressions = []
+    for record in results["benchmarks"]:
+        rate = rates.get(record["name"])
+        if rate != None and record["per_second"] < rate * (1 - tolerance):
+            regressions.append({"name": record["name"], "baseline": rate, "per_second": record["per_second"]})
+
+    return regressions
+
+
+"""command line interface, prints or writes the results as JSON"""
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark SUDOKU generation, solving and uniqueness checks.")
+    parser.add_argument("--seed", type=int, default=0, help="base seed of the generated puzzles")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark, the fastest is kept")
+    parser.add_argument("--quick", action="store_true", help="fewer puzzles, for a fast check")
+    parser.add_argument("--output", default=None, help="JSON output file, defaults to standard output")
+    parser.add_argument("--baseline", default=None, help="earlier JSON results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown allowed against the baseline")
+    arguments = parser.parse_args(arguments)
+
+    results = run_benchmarks(arguments.seed, arguments.repeat, arguments.quick)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            results["regressions"] = compare(results, json.load(baseline_file), arguments.tolerance)
+
+    text = json.dumps(results, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+
+    # a regression fails the run so it can gate a merge
+    if results.get("regressions"):
+        for regression in results["regressions"]:
+            print(f'regression: {regression["name"]} {regression["per_second"]}/s, was {regression["baseline"]}/s',
+                  file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,9 @@
 # pygame library for GUI
 import pygame as pg
 
+# import shared cache of rendered text
+from glyphCacheClass import GlyphCache
+
 """
 Allow button objects to be created
 """
@@ -32,13 +35,16 @@ class Button:
         self.win_button_text_color = self.black
         self.toggle = False
 
-    """update button color based on hover status"""
+    """update button color based on hover status, returns True if the hover status changed"""
     def update(self, mouse_position):
+        hover = self.hover
         if self.rectangle.collidepoint(mouse_position):
             self.hover = True
         else:
             self.hover = False
 
+        return hover != self.hover
+
     """display button"""
     def draw(self, window):
 
@@ -77,14 +83,11 @@ class Button:
 
     """display button text"""
     def display_text(self, text):
-        # initialize font
-        font = pg.font.SysFont("arial", 15, bold=1)
-
-        # determine font color on toggle
+        # determine font color on toggle, the text is only rendered the first time
         if self.toggle:
-            text = font.render(text, False, self.on_text_color)
+            text = GlyphCache.render("arial", 15, text, self.on_text_color, bold=True)
         else:
-            text = font.render(text, False, self.off_text_color)
+            text = GlyphCache.render("arial", 15, text, self.off_text_color, bold=True)
 
         # determine text size
         text_width, text_height = text.get_size()
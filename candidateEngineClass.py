@@ -0,0 +1,480 @@
+# import random library to randomize the order digits are guessed in
+import random
+
+"""
+Bitmask solver core used to generate and solve SUDOKU boards.
+  * Each row, column and sub-grid keeps a bitmask of the digits already placed in it,
+    so checking if a guess is legal is a single bit test.
+  * The masks are updated incrementally when a digit is placed or removed.
+  * The empty cells are collected once per search, so the next cell to guess is never rescanned.
+"""
+class CandidateEngine():
+    # look up tables shared by every engine of the same board size
+    layouts = {}
+
+    """load the digits of a board (ints or None) into the bitmasks, box_size 3 is a 9 * 9 board"""
+    def __init__(self, board, box_size=3):
+        self.size = box_size * box_size
+        self.box_size = box_size
+
+        # bit d is set in a mask when digit d is used, bit 0 is never used
+        self.full_mask = ((1 << self.size) - 1) << 1
+
+        # flat copy of the board, 0 marks an empty cell
+        self.cells = [0] * (self.size * self.size)
+
+        # digits used in each row, column and sub-grid
+        self.rows = [0] * self.size
+        self.columns = [0] * self.size
+        self.boxes = [0] * self.size
+
+        # look up tables from a flat cell index to its row, column, sub-grid and the cells of every unit
+        self.row_of, self.column_of, self.box_of, self.units = self.__layout(self.size, self.box_size)
+
+        # first solution, solutions found, search nodes visited and dead ends hit by the last search
+        self.solution = None
+        self.solutions = 0
+        self.nodes = 0
+        self.backtracks = 0
+
+        # deepest search depth and digits placed by naked and hidden singles during the last search
+        self.max_depth = 0
+        self.propagations = 0
+
+        # legality checks made by the last search, each testing every digit of a cell at once
+        # against the masks of its row, column and sub-grid
+        self.legality_checks = 0
+
+        # a given digit that clashes with another one leaves the board without a solution
+        self.conflict = False
+
+        # place every given digit
+        for i in range(self.size):
+            for j in range(self.size):
+                if board[i][j] != None:
+                    if not self.is_legal(i, j, board[i][j]):
+                        self.conflict = True
+                    self.place(i, j, board[i][j])
+
+    """build the look up tables for a board size once and share them between engines"""
+    @classmethod
+    def __layout(cls, size, box_size):
+        if size not in cls.layouts:
+            cells = range(size * size)
+            row_of = [index // size for index in cells]
+            column_of = [index % size for index in cells]
+            box_of = [(row_of[index] // box_size) * box_size + column_of[index] // box_size for index in cells]
+
+            # cells of every row, column and sub-grid, used to find hidden singles
+            units = [[index for index in cells if row_of[index] == i] for i in range(size)] \
+                    + [[index for index in cells if column_of[index] == i] for i in range(size)] \
+                    + [[index for index in cells if box_of[index] == i] for i in range(size)]
+
+            cls.layouts[size] = (row_of, column_of, box_of, units)
+
+        return cls.layouts[size]
+
+    """checks the legality of a guess with a single bit test"""
+    def is_legal(self, row, col, num):
+        used = self.rows[row] | self.columns[col] | self.boxes[(row // self.box_size) * self.box_size + col // self.box_size]
+        return not used & (1 << num)
+
+    """bitmask of the digits that can legally be placed in a cell"""
+    def candidates(self, row, col):
+        used = self.rows[row] | self.columns[col] | self.boxes[(row // self.box_size) * self.box_size + col // self.box_size]
+        return ~used & self.full_mask
+
+    """place a digit and mark it as used in its row, column and sub-grid"""
+    def place(self, row, col, num):
+        index = row * self.size + col
+        bit = 1 << num
+        self.cells[index] = num
+        self.rows[row] |= bit
+        self.columns[col] |= bit
+        self.boxes[self.box_of[index]] |= bit
+
+    """remove a digit and free it in its row, column and sub-grid"""
+    def remove(self, row, col):
+        index = row * self.size + col
+        bit = ~(1 << self.cells[index])
+        self.cells[index] = 0
+        self.rows[row] &= bit
+        self.columns[col] &= bit
+        self.boxes[self.box_of[index]] &= bit
+
+    """list the flat index of every empty cell in row major order"""
+    def empty_cells(self):
+        return [index for index in range(self.size * self.size) if self.cells[index] == 0]
+
+    """copy the engine's digits back into a board"""
+    def write_board(self, board):
+        for i in range(self.size):
+            for j in range(self.size):
+                num = self.cells[i * self.size + j]
+                board[i][j] = num if num != 0 else None
+
+    """
+    fill every empty cell with random legal digits, returns True when the board is complete
+      * generator is the random number generator used to shuffle the digits
+      * "ordered" fills the empty cells in row major order, "mrv" always fills the cell with the
+        fewest candidates next, which is needed to fill boards larger than 9 * 9 quickly
+    """
+    def fill_board(self, generator=random, strategy="ordered"):
+        self.generator = generator
+
+        if self.conflict:
+            self.__clear_counters()
+            return False
+
+        # the first solution found is left on the board
+        search = self.__search(self.empty_cells(), self.__use_mrv(strategy), True)
+        for _ in search:
+            search.close()
+            return True
+
+        return False
+
+    """
+    count every solution of the current board, the board is left unchanged
+      * "ordered" branches on the empty cells in row major order.
+      * "mrv" fills naked and hidden singles, then branches on the cell with the fewest candidates.
+      * limit stops the search as soon as that many solutions are found, None counts them all.
+    """
+    def count_solutions(self, strategy="ordered", limit=None):
+        self.solution = None
+        self.solutions = 0
+
+        if self.conflict:
+            self.__clear_counters()
+            return 0
+
+        search = self.__search(self.empty_cells(), self.__use_mrv(strategy), False)
+        for _ in search:
+            self.solutions += 1
+            if self.solution == None:
+                self.solution = self.cells[:]
+
+            # stop once enough solutions are found
+            if limit and self.solutions >= limit:
+                search.close()
+                break
+
+        return self.solutions
+
+    """
+    yield the solutions of the current board one at a time, each as a list of the digits of every cell
+      * limit stops after that many solutions, None yields every solution
+      * the board is left unchanged once the generator is exhausted or closed, until then the
+        engine is in the middle of its search and mustn't be used for anything else
+    """
+    def iter_solutions(self, strategy="ordered", limit=None):
+        if self.conflict:
+            self.__clear_counters()
+            return self.__iter_solutions(None, limit)
+
+        return self.__iter_solutions(self.__search(self.empty_cells(), self.__use_mrv(strategy), False), limit)
+
+    """copy each solution of a search, closing the search once done, no search yields nothing"""
+    def __iter_solutions(self, search, limit):
+        if search == None:
+            return
+
+        try:
+            for count, _ in enumerate(search, 1):
+                yield self.cells[:]
+                if limit and count >= limit:
+                    break
+        finally:
+            search.close()
+
+    """reset the counters of the last search, for a board that isn't searched at all"""
+    def __clear_counters(self):
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.propagations = 0
+        self.legality_checks = 0
+
+    """True for the "mrv" strategy, False for "ordered", raises a ValueError for anything else"""
+    def __use_mrv(self, strategy):
+        if strategy not in ("ordered", "mrv"):
+            raise ValueError(f'unknown search strategy "{strategy}"')
+
+        return strategy == "mrv"
+
+    """
+    depth first search over the empty cells with an explicit stack, yields with every solution on the board
+      * mrv fills naked and hidden singles at every node, then branches on the cell with the fewest
+        candidates. Otherwise the empty cells are branched on in row major order.
+      * fill tries the digits of each cell in a random order and stops at the first solution, leaving
+        it on the board. Otherwise the search goes on after each solution, and the board is left
+        unchanged once it is over or closed.
+      * The stack is one slot per empty cell in arrays allocated up front, so no board size hits
+        the recursion limit and a node costs no Python call.
+    """
+    def __search(self, empty, mrv, fill):
+        cells, rows, columns, boxes = self.cells, self.rows, self.columns, self.boxes
+        row_of, column_of, box_of = self.row_of, self.column_of, self.box_of
+        full_mask, size = self.full_mask, self.size
+
+        # cell branched on at each depth with its row, column and sub-grid, fixed up front when ordered
+        last = len(empty)
+        if mrv:
+            branch = [-1] * (last + 1)
+            row_at, column_at, box_at = branch[:], branch[:], branch[:]
+        else:
+            branch = empty
+            row_at = [row_of[index] for index in empty]
+            column_at = [column_of[index] for index in empty]
+            box_at = [box_of[index] for index in empty]
+
+        # untried digits at each depth, a bitmask when counting and a shuffled list when filling,
+        # and the length of the trail when the depth was entered
+        untried = [0] * (last + 1)
+        trail_start = [0] * (last + 1)
+
+        # digits placed by naked and hidden singles, removed again when their depth is left
+        trail = []
+
+        nodes = backtracks = max_depth = propagations = checks = 0
+        self.legality_checks = 0
+        depth = 0
+        try:
+            while depth >= 0:
+                # enter the node at depth
+                nodes += 1
+                if depth >= max_depth:
+                    max_depth = depth + 1
+
+                bit = 0
+                solved = False
+                if mrv:
+                    trail_start[depth] = len(trail)
+
+                    # a contradiction while filling singles means this branch is a dead end
+                    propagated = self.__propagate(empty, trail)
+                    propagations += len(trail) - trail_start[depth]
+                    if propagated:
+                        # find the empty cell with the fewest candidates
+                        best = -1
+                        free = 0
+                        best_count = size + 1
+                        for index in empty:
+                            if cells[index] == 0:
+                                candidates = ~(rows[row_of[index]] | columns[column_of[index]] | boxes[box_of[index]]) & full_mask
+                                checks += 1
+                                count = bin(candidates).count("1")
+                                if count < best_count:
+                                    best, free, best_count = index, candidates, count
+
+                                    # after propagation every empty cell has at least 2 candidates
+                                    if count == 2:
+                                        break
+
+                        if best == -1:
+                            solved = True
+                        else:
+                            row, column, box = row_of[best], column_of[best], box_of[best]
+                            branch[depth], row_at[depth], column_at[depth], box_at[depth] = best, row, column, box
+                    else:
+                        free = 0
+                elif depth < last:
+                    row, column, box = row_at[depth], column_at[depth], box_at[depth]
+                    free = ~(rows[row] | columns[column] | boxes[box]) & full_mask
+                    checks += 1
+                else:
+                    solved = True
+
+                # every cell is filled, so this is a solution
+                if solved:
+                    yield
+
+                    # a filled board is kept as it is
+                    if fill:
+                        break
+
+                # no legal digit left for this cell
+                elif not free:
+                    backtracks += 1
+
+                # try the first digit, a random one when filling and the lowest when counting
+                elif fill:
+                    choices = [num for num in range(1, size + 1) if free & (1 << num)]
+                    self.generator.shuffle(choices)
+                    choices.reverse()
+                    bit = 1 << choices.pop()
+                    untried[depth] = choices
+                else:
+                    bit = free & -free
+                    untried[depth] = free ^ bit
+
+                if bit:
+                    cells[branch[depth]] = bit.bit_length() - 1
+                    rows[row] |= bit
+                    columns[column] |= bit
+                    boxes[box] |= bit
+                    depth += 1
+                    continue
+
+                # leave the depth, then swap the digit of the deepest cell with one left for its next digit
+                while True:
+                    if mrv:
+                        self.__undo(trail, trail_start[depth])
+                    depth -= 1
+                    if depth < 0:
+                        break
+
+                    index = branch[depth]
+                    old = 1 << cells[index]
+
+                    # the next digit to try, the rest of the shuffled digits when filling, lowest bit first when counting
+                    if fill:
+                        choices = untried[depth]
+                        bit = 1 << choices.pop() if choices else 0
+                    else:
+                        free = untried[depth]
+                        bit = free & -free
+                        untried[depth] = free ^ bit
+
+                    change = old | bit
+                    rows[row_at[depth]] ^= change
+                    columns[column_at[depth]] ^= change
+                    boxes[box_at[depth]] ^= change
+
+                    if bit:
+                        cells[index] = bit.bit_length() - 1
+                        depth += 1
+                        break
+
+                    # every digit failed, this branch is a dead end when filling
+                    cells[index] = 0
+                    if fill:
+                        backtracks += 1
+        finally:
+            self.nodes = nodes
+            self.backtracks = backtracks
+            self.max_depth = max_depth
+            self.propagations = propagations
+            self.legality_checks += checks
+
+            # stopped before the search was over, put every cell back as it was
+            if depth >= 0 and not fill:
+                for level in range(depth):
+                    self.__clear(branch[level])
+                self.__undo(trail, 0)
+
+    """
+    solve the current board, filling the engine's cells with the first solution found
+      * returns True if the board has a solution
+    """
+    def solve(self, strategy="ordered"):
+        if not self.count_solutions(strategy, limit=1):
+            return False
+
+        for index in self.empty_cells():
+            self.__set(index, self.solution[index])
+
+        return True
+
+    """place naked and hidden singles until none are left, returns False on a contradiction"""
+    def __propagate(self, empty, trail):
+        cells, rows, columns, boxes = self.cells, self.rows, self.columns, self.boxes
+        row_of, column_of, box_of = self.row_of, self.column_of, self.box_of
+        full_mask = self.full_mask
+
+        # legality checks are added to the search's however the passes end
+        checks = 0
+        try:
+            changed = True
+            while changed:
+                changed = False
+
+                # candidates of every empty cell for this pass
+                free_of = {}
+
+                # naked singles: an empty cell with a single candidate
+                for index in empty:
+                    if cells[index] == 0:
+                        free = ~(rows[row_of[index]] | columns[column_of[index]] | boxes[box_of[index]]) & full_mask
+                        checks += 1
+                        if not free:
+                            return False
+                        if not free & (free - 1):
+                            self.__set(index, free.bit_length() - 1)
+                            trail.append(index)
+                            changed = True
+                        else:
+                            free_of[index] = free
+
+                # look for hidden singles once the naked singles are used up
+                if changed:
+                    continue
+
+                # hidden singles: a digit with a single possible cell in a row, column or sub-grid
+                for unit in self.units:
+                    once = 0
+                    more = 0
+                    used = 0
+                    for index in unit:
+                        num = cells[index]
+                        if num:
+                            used |= 1 << num
+                        else:
+                            free = free_of[index]
+                            more |= once & free
+                            once |= free
+
+                    # a missing digit with nowhere to go
+                    if once | used != full_mask:
+                        return False
+
+                    # stale candidates can still hold a digit placed in the unit by an earlier hidden single
+                    hidden = once & ~more & ~used
+                    while hidden:
+                        bit = hidden & -hidden
+                        hidden ^= bit
+
+                        for index in unit:
+                            if cells[index] == 0 and free_of[index] & bit:
+                                # candidates are from the start of the pass, the digit may have been placed
+                                # in a peer since
+                                if not self.__free(index) & bit:
+                                    return False
+                                self.__set(index, bit.bit_length() - 1)
+                                trail.append(index)
+                                changed = True
+                                break
+
+                        # the digit's only cell was taken by another hidden single
+                        else:
+                            return False
+        finally:
+            self.legality_checks += checks
+
+        return True
+
+    """bitmask of the legal digits for a flat cell index"""
+    def __free(self, index):
+        return ~(self.rows[self.row_of[index]] | self.columns[self.column_of[index]] | self.boxes[self.box_of[index]]) \
+               & self.full_mask
+
+    """place a digit by flat cell index"""
+    def __set(self, index, num):
+        bit = 1 << num
+        self.cells[index] = num
+        self.rows[self.row_of[index]] |= bit
+        self.columns[self.column_of[index]] |= bit
+        self.boxes[self.box_of[index]] |= bit
+
+    """remove a digit by flat cell index"""
+    def __clear(self, index):
+        bit = ~(1 << self.cells[index])
+        self.cells[index] = 0
+        self.rows[self.row_of[index]] &= bit
+        self.columns[self.column_of[index]] &= bit
+        self.boxes[self.box_of[index]] &= bit
+
+    """remove the digits placed by propagation after position start of the trail, most recent first"""
+    def __undo(self, trail, start):
+        while len(trail) > start:
+            self.__clear(trail.pop())
@@ -0,0 +1,188 @@
+"""
+Canonical form of SUDOKU boards, the same string for every board that is the same puzzle up to symmetry.
+  * Two boards are equivalent when one can be turned into the other by relabeling the digits,
+    swapping rows within a band, swapping bands, swapping columns within a stack, swapping stacks
+    or transposing the board.
+  * The canonical form is the smallest board string among every equivalent board, with the digits
+    relabeled 1, 2, 3... in the order they are first read and 0 (an empty cell) before every digit.
+  * The smallest string is built one row at a time, keeping only the transformations that give
+    the smallest rows so far. Columns that can't be told apart yet (empty in every row so far) are
+    kept together instead of trying every order of them, so a puzzle costs a few hundred row
+    comparisons rather than the 2 * 6^8 * 9! transformations of a 9 * 9 board.
+  * Highly symmetric boards (few clues repeated in a pattern, or complete solutions) tie on many
+    transformations and take longer.
+
+Usage:
+    canonical_form(puzzle) == canonical_form(other)
+"""
+
+# import compact board to read board strings and write the canonical string
+from compactBoardClass import CompactBoard
+
+# import groupby to find stacks that tie, permutations and product to branch on their orders
+from itertools import groupby, permutations, product
+
+
+"""
+canonical form of a board string (0 or . for an empty cell) of any box size
+  * returns a board string of the same size, equal for two boards exactly when they are equivalent
+  * raises a ValueError for a digit repeated in a row or column
+"""
+def canonical_form(puzzle):
+    board = CompactBoard.from_string(puzzle)
+    size = board.size
+    box_size = int(round(size ** 0.5))
+
+    # the board's rows and, for the transposed board, its columns
+    cells = board.cells
+    grids = ([tuple(cells[i * size:(i + 1) * size]) for i in range(size)],
+             [tuple(cells[j::size]) for j in range(size)])
+
+    # a repeated digit would tie with itself in every order
+    for line in grids[0] + grids[1]:
+        digits = [num for num in line if num]
+        if len(digits) != len(set(digits)):
+            raise ValueError(f'{puzzle} repeats a digit in a row or column')
+
+    # columns placed so far, as a list of groups of stacks, see _refine. At first every stack is tied.
+    stacks = [[tuple(range(stack * box_size, (stack + 1) * box_size))] for stack in range(box_size)]
+
+    # each candidate is a transposition, the rows placed so far, the columns and the digit labels
+    candidates = [(transposed, (), [stacks], {}) for transposed in (0, 1)]
+
+    canonical = []
+    for position in range(size):
+        best = None
+        winners = []
+        for transposed, order, groups, labels in candidates:
+            for row in _next_rows(order, position, box_size):
+                key, parts = _refine(groups, labels, grids[transposed][row], size)
+
+                # keep only the candidates giving the smallest row
+                if best == None or key < best:
+                    best = key
+                    winners = [(transposed, order + (row,), labels, parts)]
+                elif key == best:
+                    winners.append((transposed, order + (row,), labels, parts))
+
+        canonical.extend(best)
+
+        # every order of the tied columns and new digits is a candidate for the next rows
+        if position == size - 1:
+            break
+
+        # candidates with the same rows left, columns and labels finish the same way, whatever
+        # order the rows were placed in, so only one of them is kept
+        candidates = []
+        states = set()
+        for transposed, order, labels, parts in winners:
+            for groups, next_labels in _branches(parts, labels):
+                state = (transposed, frozenset(order), order[-1] // box_size,
+                         tuple(tuple(tuple(stack) for stack in group) for group in groups),
+                         tuple(next_labels.items()))
+                if state not in states:
+                    states.add(state)
+                    candidates.append((transposed, order, groups, next_labels))
+
+    return "".join(CompactBoard.symbols[num] for num in canonical)
+
+
+"""rows that can be placed at a position, any row of an unused band to start a band, else the rest of the band"""
+def _next_rows(order, position, box_size):
+    if position % box_size == 0:
+        used = {row // box_size for row in order}
+        return [row for row in range(box_size * box_size) if row // box_size not in used]
+
+    band = order[-1] // box_size
+    return [row for row in range(band * box_size, (band + 1) * box_size) if row not in order]
+
+
+"""
+smallest arrangement of a row of values under the columns placed so far
+  * groups is the column order so far: a list of groups of stacks, each stack a list of cells and
+    each cell a tuple of columns whose order is still free. A group of one stack is in place, a
+    group of several stacks holds stacks whose order is still free, every cell of them empty so far.
+  * In each cell the empty columns go first, then the labeled digits in order, then the new digits.
+    Tied stacks are sorted the same way, all empty ones stay tied.
+  * returns the row's labels, new digits numbered on from the labels used so far, and the parts
+    of the next column order, each a list of alternatives (groups, new digits in order) that give
+    this same row. Only orders of new digits or of stacks with new digits have more than one.
+"""
+def _refine(groups, labels, values, size):
+    # new digits sort after every label, they are numbered in reading order at the end
+    new = size + 1
+
+    key = []
+    parts = []
+    for group in groups:
+        if len(group) == 1:
+            pattern, alternatives = _arrange(group[0], labels, values, new)
+            key.extend(pattern)
+            parts.append([([[cells]], digits) for cells, digits in alternatives])
+            continue
+
+        # tied stacks sorted by their own smallest arrangement
+        arranged = sorted((_arrange(stack, labels, values, new) for stack in group), key=lambda item: item[0])
+        for pattern, members in groupby(arranged, key=lambda item: item[0]):
+            members = [alternatives for _, alternatives in members]
+            key.extend(pattern * len(members))
+
+            # stacks still empty stay tied
+            if not any(pattern):
+                parts.append([([[alternatives[0][0] for alternatives in members]], [])])
+                continue
+
+            # equal stacks with new digits can go in any order, each order labels the digits differently
+            choices = []
+            for ordered in permutations(members):
+                for combination in product(*ordered):
+                    choices.append(([[cells] for cells, _ in combination],
+                                    [digit for _, digits in combination for digit in digits]))
+            parts.append(choices)
+
+    # number the new digits in reading order
+    label = len(labels)
+    for i, num in enumerate(key):
+        if num == new:
+            label += 1
+            key[i] = label
+
+    return key, parts
+
+
+"""
+smallest arrangement of the cells of one stack
+  * returns the pattern of labels (new digits as new) and every alternative (cells, new digits in order)
+"""
+def _arrange(stack, labels, values, new):
+    pattern = []
+    alternatives = [([], [])]
+    for cell in stack:
+        empty = tuple(column for column in cell if not values[column])
+        known = sorted((labels[values[column]], column) for column in cell if values[column] in labels)
+        fresh = [column for column in cell if values[column] and values[column] not in labels]
+
+        pattern.extend([0] * len(empty) + [label for label, _ in known] + [new] * len(fresh))
+
+        # empty columns stay together, labeled digits are in place
+        head = ([empty] if empty else []) + [(column,) for _, column in known]
+
+        # every order of the new digits gives the same row
+        orders = list(permutations(fresh)) if len(fresh) > 1 else [fresh]
+        alternatives = [(cells + head + [(column,) for column in order], digits + [values[column] for column in order])
+                        for cells, digits in alternatives for order in orders]
+
+    return tuple(pattern), alternatives
+
+
+"""every candidate column order and labels from the parts of a refined row"""
+def _branches(parts, labels):
+    for combination in product(*parts):
+        groups = []
+        next_labels = dict(labels)
+        for part_groups, digits in combination:
+            groups.extend(part_groups)
+            for digit in digits:
+                next_labels[digit] = len(next_labels) + 1
+
+        yield groups, next_labels
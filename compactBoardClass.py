@@ -0,0 +1,119 @@
+"""
+Compact SUDOKU board stored as one byte per cell, row by row, with 0 for an empty cell.
+  * A board backed by bytes is read only and shares its cells when copied, so cloning it is O(1).
+  * A board backed by a bytearray can be changed, copying it copies the bytes.
+  * board[row][column] reads and writes a cell as an int or None, like the nested lists it replaces.
+  * A 9 * 9 board takes 81 bytes, larger boards (16 * 16, 25 * 25) store size * size bytes.
+"""
+class CompactBoard():
+    __slots__ = ("cells", "size")
+
+    # character of each cell value in board strings, 0 is an empty cell and 10 to 25 are letters
+    symbols = "0123456789ABCDEFGHIJKLMNOP"
+
+    """create a size * size board from its cell values, an empty board if cells is None"""
+    def __init__(self, cells=None, size=9):
+        self.cells = bytearray(cells) if cells != None else bytearray(size * size)
+        self.size = size
+
+    """create a board from rows of ints or None"""
+    @classmethod
+    def from_rows(cls, rows):
+        return cls((num or 0 for row in rows for num in row), len(rows))
+
+    """create a board from a string of size * size symbols, 0 or . marking an empty cell"""
+    @classmethod
+    def from_string(cls, text):
+        size = int(len(text) ** 0.5)
+        return cls((cls.symbols.index(char) if char != "." else 0 for char in text.upper()), size)
+
+    """read only snapshot of the board, the cells are shared by every copy of the snapshot"""
+    def freeze(self):
+        board = CompactBoard.__new__(CompactBoard)
+        board.cells = bytes(self.cells)
+        board.size = self.size
+
+        return board
+
+    """copy the board, O(1) for a read only board"""
+    def copy(self):
+        if isinstance(self.cells, bytes):
+            return self
+
+        return CompactBoard(self.cells, self.size)
+
+    """value of a cell, None if empty"""
+    def get(self, row, column):
+        return self.cells[row * self.size + column] or None
+
+    """set the value of a cell, None to empty it"""
+    def set(self, row, column, num):
+        self.cells[row * self.size + column] = num or 0
+
+    """values of a row, None for empty cells"""
+    def row(self, row):
+        return [num or None for num in self.cells[row * self.size:(row + 1) * self.size]]
+
+    """values of a column, None for empty cells"""
+    def column(self, column):
+        return [num or None for num in self.cells[column::self.size]]
+
+    """board as rows of ints or None"""
+    def to_rows(self):
+        return [self.row(i) for i in range(self.size)]
+
+    """board as a string of size * size symbols, 0 marking an empty cell"""
+    def to_string(self):
+        return "".join(self.symbols[num] for num in self.cells)
+
+    """view of a row that reads and writes its cells, so board[row][column] keeps working"""
+    def __getitem__(self, row):
+        return BoardRow(self.cells, row * self.size, self.size)
+
+    """iterate the rows of the board"""
+    def __iter__(self):
+        for i in range(self.size):
+            yield BoardRow(self.cells, i * self.size, self.size)
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        if isinstance(other, CompactBoard):
+            return self.cells == other.cells
+
+        return self.to_rows() == other
+
+    def __repr__(self):
+        return str(self.to_rows())
+
+
+"""
+View of one row of a CompactBoard.
+"""
+class BoardRow():
+    __slots__ = ("cells", "offset", "size")
+
+    def __init__(self, cells, offset, size):
+        self.cells = cells
+        self.offset = offset
+        self.size = size
+
+    def __getitem__(self, column):
+        return self.cells[self.offset + column] or None
+
+    def __setitem__(self, column, num):
+        self.cells[self.offset + column] = num or 0
+
+    def __iter__(self):
+        for num in self.cells[self.offset:self.offset + self.size]:
+            yield num or None
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return str(list(self))
@@ -0,0 +1,363 @@
+# import random library to randomize the order rows are tried in when filling a board
+import random
+
+"""
+Dancing Links (Algorithm X) solver backend for SUDOKU boards.
+  * A board is an exact cover problem: each row places one digit in one cell and covers 4 columns
+    (the cell, the digit in its row, column and sub-grid), 729 rows and 324 columns for a 9 * 9 board.
+  * The matrix is kept as circular doubly linked lists in flat arrays, so covering and uncovering
+    a column is done in place and the search always branches on the column with the fewest rows.
+  * Offers the same entry points as CandidateEngine so SudokuBoard can use either backend.
+"""
+class DancingLinks():
+    # linked matrix of an empty board, shared by every solver of the same board size
+    templates = {}
+
+    """build the linked matrix and select the rows of every given digit"""
+    def __init__(self, board, box_size=3):
+        self.size = box_size * box_size
+        self.box_size = box_size
+
+        # flat copy of the board, 0 marks an empty cell
+        self.cells = [0] * (self.size * self.size)
+
+        # copy the links of an empty board
+        left, right, up, down, column, count, row_of_node = self.__template(self.size, self.box_size)
+        self.left = left[:]
+        self.right = right[:]
+        self.up = up[:]
+        self.down = down[:]
+        self.column = column
+        self.count = count[:]
+        self.row_of_node = row_of_node
+
+        # first node of every matrix row, used to select the given digits
+        self.first_node = [0] * (self.size * self.size * self.size)
+        for node in range(len(row_of_node) - 1, self.size * self.size * 4, -1):
+            self.first_node[row_of_node[node]] = node
+
+        # rows chosen by the search, solutions found, search nodes visited and dead ends hit by the last search
+        self.partial = []
+        self.generator = None
+        self.solution = None
+        self.solutions = 0
+        self.nodes = 0
+        self.backtracks = 0
+
+        # deepest search depth of the last search, the search places no digits by propagation
+        self.max_depth = 0
+        self.propagations = 0
+
+        # legality checks made by the last search, each a constraint column whose count of rows
+        # (legal placements) left is compared while choosing the column to branch on
+        self.legality_checks = 0
+
+        # a given digit that clashes with another one leaves the board without a solution
+        self.conflict = False
+        covered = [False] * (self.size * self.size * 4 + 1)
+        for i in range(self.size):
+            for j in range(self.size):
+                if board[i][j] != None:
+                    self.cells[i * self.size + j] = board[i][j]
+                    node = self.first_node[(i * self.size + j) * self.size + board[i][j] - 1]
+
+                    # cover the 4 columns of the given's row
+                    for k in range(4):
+                        if covered[self.column[node + k]]:
+                            self.conflict = True
+                        else:
+                            covered[self.column[node + k]] = True
+                            self.__cover(self.column[node + k])
+
+    """build the linked matrix of an empty board once for each board size"""
+    @classmethod
+    def __template(cls, size, box_size):
+        if size not in cls.templates:
+            area = size * size
+
+            # node 0 is the root, nodes 1 to 4 * area are the column headers
+            headers = 4 * area + 1
+            left = [i - 1 for i in range(headers)]
+            right = [i + 1 for i in range(headers)]
+            left[0] = headers - 1
+            right[headers - 1] = 0
+            up = list(range(headers))
+            down = list(range(headers))
+            column = list(range(headers))
+            count = [0] * headers
+            row_of_node = [-1] * headers
+
+            for index in range(area):
+                row, col = index // size, index % size
+                box = (row // box_size) * box_size + col // box_size
+
+                for digit in range(size):
+                    # cell filled, digit in row, digit in column, digit in sub-grid
+                    columns = [1 + index,
+                               1 + area + row * size + digit,
+                               1 + 2 * area + col * size + digit,
+                               1 + 3 * area + box * size + digit]
+
+                    # link the 4 nodes of the matrix row into a circle
+                    first = len(column)
+                    for k in range(4):
+                        node = first + k
+                        left.append(first + (k - 1) % 4)
+                        right.append(first + (k + 1) % 4)
+
+                        # insert the node at the bottom of its column
+                        header = columns[k]
+                        up.append(up[header])
+                        down.append(header)
+                        down[up[header]] = node
+                        up[header] = node
+                        column.append(header)
+                        count[header] += 1
+                        row_of_node.append(index * size + digit)
+
+            cls.templates[size] = (left, right, up, down, column, count, row_of_node)
+
+        return cls.templates[size]
+
+    """remove a column header and every row crossing it from the matrix"""
+    def __cover(self, header):
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+
+        row = down[header]
+        while row != header:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                count[column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    """put a covered column and its rows back, in the reverse order they were removed"""
+    def __uncover(self, header):
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+
+        row = up[header]
+        while row != header:
+            node = left[row]
+            while node != row:
+                count[column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+
+        right[left[header]] = header
+        left[right[header]] = header
+
+    """list the flat index of every empty cell in row major order"""
+    def empty_cells(self):
+        return [index for index in range(self.size * self.size) if self.cells[index] == 0]
+
+    """copy the solver's digits back into a board"""
+    def write_board(self, board):
+        for i in range(self.size):
+            for j in range(self.size):
+                num = self.cells[i * self.size + j]
+                board[i][j] = num if num != 0 else None
+
+    """
+    fill every empty cell with random legal digits, returns True when the board is complete
+      * generator is the random number generator used to shuffle the rows
+      * strategy is accepted for the same signature as CandidateEngine
+    """
+    def fill_board(self, generator=random, strategy="ordered"):
+        self.generator = generator
+        filled = self.solve()
+        self.generator = None
+
+        return filled
+
+    """
+    count every solution of the current board, the board is left unchanged
+      * strategy is accepted for the same signature as CandidateEngine, the search always
+        branches on the column with the fewest rows
+      * limit stops the search as soon as that many solutions are found, None counts them all.
+    """
+    def count_solutions(self, strategy="ordered", limit=None):
+        self.solution = None
+        self.solutions = 0
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.legality_checks = 0
+
+        if self.conflict:
+            return 0
+
+        search = self.__search()
+        for _ in search:
+            self.solutions += 1
+            if self.solution == None:
+                self.solution = self.__solution_cells()
+
+            # stop once enough solutions are found
+            if limit and self.solutions >= limit:
+                search.close()
+                break
+
+        return self.solutions
+
+    """
+    yield the solutions of the current board one at a time, each as a list of the digits of every cell
+      * strategy is accepted for the same signature as CandidateEngine
+      * limit stops after that many solutions, None yields every solution
+      * the matrix is left unchanged once the generator is exhausted or closed, until then the
+        solver is in the middle of its search and mustn't be used for anything else
+    """
+    def iter_solutions(self, strategy="ordered", limit=None):
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.legality_checks = 0
+
+        return self.__iter_solutions(limit)
+
+    """copy each solution of the search, closing the search once done"""
+    def __iter_solutions(self, limit):
+        if self.conflict:
+            return
+
+        search = self.__search()
+        try:
+            for count, _ in enumerate(search, 1):
+                yield self.__solution_cells()
+                if limit and count >= limit:
+                    break
+        finally:
+            search.close()
+
+    """digits of every cell with the chosen rows filled in"""
+    def __solution_cells(self):
+        cells = self.cells[:]
+        for row in self.partial:
+            cells[row // self.size] = row % self.size + 1
+
+        return cells
+
+    """
+    solve the current board, filling the solver's cells with the first solution found
+      * returns True if the board has a solution
+    """
+    def solve(self, strategy="ordered"):
+        if not self.count_solutions(strategy, limit=1):
+            return False
+
+        self.cells = self.solution
+        return True
+
+    """
+    Algorithm X search over the uncovered columns with an explicit stack, yields with the rows of
+    every solution chosen
+      * The column covered, its untried rows and the row chosen at each depth are kept in arrays
+        allocated up front, one slot per empty cell, so no board size hits the recursion limit.
+      * Closing the search early uncovers every chosen row and column again, deepest first.
+    """
+    def __search(self):
+        right, down, count = self.right, self.down, self.count
+
+        # column covered, rows left to try (last one first) and row chosen at each depth
+        levels = self.cells.count(0) + 1
+        covered = [0] * levels
+        untried = [None] * levels
+        chosen = [0] * levels
+
+        depth = 0
+        try:
+            while depth >= 0:
+                # enter the node at depth
+                self.nodes += 1
+                if depth >= self.max_depth:
+                    self.max_depth = depth + 1
+
+                rows = None
+
+                # every column is covered, so the chosen rows are a solution
+                if right[0] == 0:
+                    yield
+                else:
+                    # choose the column with the fewest rows left
+                    header = right[0]
+                    best = header
+                    checks = 0
+                    while header != 0:
+                        checks += 1
+                        if count[header] < count[best]:
+                            best = header
+                            if count[best] < 2:
+                                break
+                        header = right[header]
+                    self.legality_checks += checks
+
+                    # a constraint nothing can satisfy anymore
+                    if count[best] == 0:
+                        self.backtracks += 1
+                    else:
+                        self.__cover(best)
+
+                        # collect the rows of the column, shuffled when filling a random board
+                        rows = []
+                        row = down[best]
+                        while row != best:
+                            rows.append(row)
+                            row = down[row]
+                        if self.generator != None:
+                            self.generator.shuffle(rows)
+                        rows.reverse()
+
+                        covered[depth] = best
+                        untried[depth] = rows
+
+                # choose the first row and go deeper
+                if rows:
+                    chosen[depth] = rows.pop()
+                    self.__choose(chosen[depth])
+                    depth += 1
+                    continue
+
+                # back up to the deepest column with a row left to try, un-choosing rows on the way
+                while True:
+                    depth -= 1
+                    if depth < 0:
+                        break
+
+                    self.__unchoose(chosen[depth])
+                    rows = untried[depth]
+                    if rows:
+                        chosen[depth] = rows.pop()
+                        self.__choose(chosen[depth])
+                        depth += 1
+                        break
+
+                    self.__uncover(covered[depth])
+        finally:
+            # stopped before the search was over, put the matrix back as it was
+            for level in range(depth - 1, -1, -1):
+                self.__unchoose(chosen[level])
+                self.__uncover(covered[level])
+
+    """choose a row, covering the other columns it satisfies"""
+    def __choose(self, row):
+        right = self.right
+        self.partial.append(self.row_of_node[row])
+        node = right[row]
+        while node != row:
+            self.__cover(self.column[node])
+            node = right[node]
+
+    """un-choose a row, uncovering its other columns in reverse order"""
+    def __unchoose(self, row):
+        left = self.left
+        node = left[row]
+        while node != row:
+            self.__uncover(self.column[node])
+            node = left[node]
+        self.partial.pop()
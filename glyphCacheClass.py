@@ -0,0 +1,30 @@
+# pygame library for fonts
+import pygame as pg
+
+"""
+Shared cache of fonts and pre-rendered text surfaces.
+  * Each font is looked up with SysFont once, font matching is slow.
+  * Each (font, size, bold, text, color) is rendered once and the same surface is blitted on every frame.
+"""
+class GlyphCache():
+    # fonts by (name, size, bold) and rendered surfaces by (name, size, bold, text, color)
+    fonts = {}
+    glyphs = {}
+
+    """font matching name and size, looked up on first use"""
+    @classmethod
+    def font(cls, name, size, bold=False):
+        key = (name, size, bold)
+        if key not in cls.fonts:
+            cls.fonts[key] = pg.font.SysFont(name, size, bold=bold)
+
+        return cls.fonts[key]
+
+    """surface with text rendered in color, rendered on first use"""
+    @classmethod
+    def render(cls, name, size, text, color, bold=False):
+        key = (name, size, bold, text, tuple(color))
+        if key not in cls.glyphs:
+            cls.glyphs[key] = cls.font(name, size, bold).render(text, False, color)
+
+        return cls.glyphs[key]
@@ -0,0 +1,118 @@
+# import logical solver to find the easiest next deduction
+from techniqueSolverClass import TechniqueSolver
+from compactBoardClass import CompactBoard
+
+# import Zobrist keys to hash board states
+from zobristHash import zobrist_keys
+
+# import ordered dict for the bounded hint cache
+from collections import OrderedDict
+
+"""
+Next step hints for a player board: the easiest logical deduction, as a cell, its digit and the technique.
+  * A digit differing from the solution is hinted first, technique "mistake", since no deduction
+    holds on a board with a mistake. Mistakes are tracked by each edit and hinted earliest first.
+  * Otherwise TechniqueSolver.next_placement finds the easiest next digit to place from the
+    player's digits. When no technique makes progress the most constrained empty cell is revealed
+    with technique None.
+  * Hints are cached per board state, keyed by a Zobrist hash of the board (see zobristHash) that
+    each edit updates in O(1), so asking again, or after undoing an edit, is a dict lookup. The
+    cache_size most recently used states are kept.
+  * An edit writing a correct digit outside the hint cell keeps a single (an easy hint) for the new
+    board: it still holds and nothing easier can appear, so no search is run for it.
+"""
+class HintEngine():
+    """start from a player board and its solution, boards of ints or None indexed [row][column]"""
+    def __init__(self, board, solution, box_size=3, cache_size=4096):
+        self.box_size = box_size
+        self.size = box_size * box_size
+        self.cache_size = cache_size
+        self.keys = zobrist_keys(self.size)
+
+        self.solution = bytes(solution[i][j] or 0 for i in range(self.size) for j in range(self.size))
+        self.cells = bytearray(self.size * self.size)
+        self.key = 0
+
+        # cells holding a wrong digit, in the order the mistakes were made
+        self.mistakes = {}
+
+        # hint of each board state seen, least recently used first
+        self.hints = OrderedDict()
+
+        self.load(board)
+
+    """bring the engine to a whole board, editing only the cells that differ"""
+    def load(self, board):
+        for i in range(self.size):
+            for j in range(self.size):
+                if (board[i][j] or 0) != self.cells[i * self.size + j]:
+                    self.edit(i, j, board[i][j])
+
+    """
+    write a digit or None to a cell, in O(1)
+      * the hint of the board before the edit is kept for the new board when it is a single still
+        holding after the edit
+    """
+    def edit(self, row, column, num):
+        index = row * self.size + column
+        old = self.cells[index]
+        num = num or 0
+        if num == old:
+            return
+
+        hint = self.hints.get(self.key)
+
+        self.key ^= self.keys[index][old] ^ self.keys[index][num]
+        self.cells[index] = num
+
+        self.mistakes.pop(index, None)
+        if num and num != self.solution[index]:
+            self.mistakes[index] = True
+
+        # a correct digit elsewhere only removes candidates, the single is still a single
+        if hint != None and hint[2] in ("naked single", "hidden single") and num == self.solution[index] \
+                and hint[0] != (row, column) and self.key not in self.hints:
+            self.__store(hint)
+
+    """
+    hint for the board as it is now
+      * returns ((row, column), digit, technique), or None once the board is solved
+    """
+    def hint(self):
+        # earliest mistake first
+        if self.mistakes:
+            index = next(iter(self.mistakes))
+            return divmod(index, self.size), self.solution[index], "mistake"
+
+        hint = self.hints.get(self.key)
+        if hint != None:
+            self.hints.move_to_end(self.key)
+            return hint
+
+        if 0 not in self.cells:
+            return None
+
+        hint = self.__deduce()
+        self.__store(hint)
+
+        return hint
+
+    """easiest next placement on the board, which holds no mistakes"""
+    def __deduce(self):
+        solver = TechniqueSolver(CompactBoard(self.cells, self.size), self.box_size)
+        placement = solver.next_placement()
+        if placement != None:
+            index, num, technique = placement
+            return divmod(index, self.size), num, technique
+
+        # no technique progresses, reveal the empty cell with the fewest candidates
+        empty = [index for index in range(self.size * self.size) if not self.cells[index]]
+        index = min(empty, key=lambda index: bin(solver.candidates[index]).count("1"))
+
+        return divmod(index, self.size), self.solution[index], None
+
+    """cache the hint of the current board, dropping the least recently used board when full"""
+    def __store(self, hint):
+        self.hints[self.key] = hint
+        if len(self.hints) > self.cache_size:
+            self.hints.popitem(last=False)
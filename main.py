@@ -6,29 +6,47 @@ Programming Method:
   4. Pygame is utilized for the game GUI.
 
 Sudoku Rules:
-  1. Every puzzle is randomly generated with exactly one correct solution and exactly 27 free clues.
+  1. Every puzzle is randomly generated with exactly one correct solution and 27 free clues, or a number of clues
+     matching the chosen difficulty.
   2. Each of the 9 sub-grids must contain the digits 1-9.
   3. Each number can only appear once in a row, column or sub-grid.
 
 How to play:
   1. Expand the play window for the best experience.
   2. Select any cell by left clicking on it.
-  3. Input digits with the number keys on your keyboard.
+  3. Input digits with the number keys on your keyboard, on a 16 * 16 board digits 10 to 16 are the letters A to G.
   4. Remove inputs with the delete key or backspace key.
   5. Toggle "Check" on when you have completed the game to see if you win.
 
 Game features:
   1. "Solve" with automatically solve any blank or incorrect cells. Solved cells will be displayed in pink.
   2. "New" will generate a new random valid puzzle.
-  3. "Hint" will give you a single additional clue. It will display the correct value for the first cell being blank or marked as breaking the Sudoku rule set.
+  3. "Hint" will give you a single additional clue. A cell holding a wrong digit is hinted first, as a "mistake", with its correct value. Otherwise it displays the digit the easiest logical step places next (a naked single, an x-wing, ...), SudokuEngine.hint() also returns the name of that technique.
   4. "Check" will display invalid duplicate's in a sub-grid, column, or row as red. If the cell is a valid input, it will be displayed as green.
   5. "Reset" will clear the puzzle to the beginning state.
+
+Larger boards:
+  python main.py 4 plays a 16 * 16 board, the argument is the sub-grid size (2 to 5, 3 by default).
+
+Difficulty:
+  python main.py 3 hard plays hard puzzles, the difficulty is easy, medium, hard or expert (any by default),
+  4 * 4 puzzles are always easy.
 """
 
 from pygameGuiClass import PygameGUI
+from techniqueSolverClass import TechniqueSolver
+import sys
 
 if __name__ == "__main__":
-    game = PygameGUI()
+    box_size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    difficulty = sys.argv[2] if len(sys.argv) > 2 else None
+
+    # a difficulty the board size never reaches would generate forever
+    if difficulty != None and difficulty not in TechniqueSolver.difficulties_for(box_size):
+        sys.exit(f'a {box_size * box_size} * {box_size * box_size} puzzle is never "{difficulty}", '
+                 f'choose one of {", ".join(TechniqueSolver.difficulties_for(box_size))}')
+
+    game = PygameGUI(box_size=box_size, difficulty=difficulty)
     game.run()
 
 main()
\ No newline at end of file
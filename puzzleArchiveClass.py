@@ -0,0 +1,191 @@
+# import sudoku board class to write and read boards
+from sudokuBoardClass import SudokuBoard
+from compactBoardClass import CompactBoard
+
+# import logical solver for the difficulty names stored in the header
+from techniqueSolverClass import TechniqueSolver
+
+# import libraries for the memory mapped records, the header and its metadata
+import json, mmap, struct
+
+"""
+Binary archive of puzzles and their solutions in fixed size records.
+  * The header holds the box size, the difficulty of every puzzle (or none), the record size and
+    JSON metadata. The records follow it, so puzzle k is at a fixed offset and the puzzle count
+    follows from the file size.
+  * A record packs the solution one nibble per cell (the digit minus 1, a byte per cell for boards
+    larger than 16 * 16) followed by a bitmask of the given cells, so a 9 * 9 puzzle and its
+    solution take 52 bytes instead of 164 as text.
+  * PuzzleArchive maps the file read only: opening it reads only the header, puzzle k is unpacked
+    on demand, and every process reading the same archive shares its pages.
+  * PuzzleArchiveWriter streams records to the end of the file, an archive cut short keeps every
+    whole record written before.
+
+Usage:
+    with PuzzleArchiveWriter("puzzles.sdka", difficulty="hard") as writer:
+        writer.add_board(board)
+
+    with PuzzleArchive("puzzles.sdka") as archive:
+        board = archive.load_board(12345)
+"""
+
+# magic, version, box size, difficulty (0 for none), record size, metadata size
+HEADER = struct.Struct("<8sHBBII")
+MAGIC = b"SUDOKUPA"
+VERSION = 1
+
+# board symbol of each digit to the hex digit of the digit minus 1, and back
+_TO_HEX = str.maketrans(CompactBoard.symbols[1:17], "0123456789abcdef")
+_FROM_HEX = str.maketrans("0123456789abcdef", CompactBoard.symbols[1:17])
+
+# given cells of a puzzle string as a string of bits
+_TO_BITS = str.maketrans(CompactBoard.symbols + ".", "0" + "1" * (len(CompactBoard.symbols) - 1) + "0")
+
+
+"""sizes of a record for a box size, the packed solution and the given cell bitmask in bytes"""
+def record_sizes(box_size):
+    cells = box_size ** 4
+    solution = (cells + 1) // 2 if box_size <= 4 else cells
+
+    return solution, (cells + 7) // 8
+
+
+"""pack a puzzle and its solution string into a record"""
+def pack_record(puzzle, solution, box_size):
+    solution_size, mask_size = record_sizes(box_size)
+
+    if box_size <= 4:
+        packed = bytes.fromhex(solution.translate(_TO_HEX).ljust(solution_size * 2, "0"))
+    else:
+        packed = bytes(CompactBoard.symbols.index(char) for char in solution)
+
+    return packed + int(puzzle.translate(_TO_BITS), 2).to_bytes(mask_size, "big")
+
+
+"""unpack a record into its puzzle and solution strings"""
+def unpack_record(record, box_size):
+    solution_size, mask_size = record_sizes(box_size)
+    cells = box_size ** 4
+
+    if box_size <= 4:
+        solution = record[:solution_size].hex()[:cells].translate(_FROM_HEX)
+    else:
+        solution = "".join(CompactBoard.symbols[num] for num in record[:solution_size])
+
+    bits = format(int.from_bytes(record[solution_size:], "big"), f'0{cells}b')
+    puzzle = "".join(char if given == "1" else "0" for char, given in zip(solution, bits))
+
+    return puzzle, solution
+
+
+"""
+Writes puzzles and solutions to an archive file, replacing any file at path.
+"""
+class PuzzleArchiveWriter():
+    """
+    start an archive of box_size puzzles
+      * difficulty is the difficulty of every puzzle, None when they are mixed or ungraded
+      * metadata is any JSON serializable dict stored in the header, the generator settings for example
+    """
+    def __init__(self, path, box_size=3, difficulty=None, metadata=None):
+        self.path = path
+        self.box_size = box_size
+        self.difficulty = difficulty
+        self.count = 0
+
+        solution_size, mask_size = record_sizes(box_size)
+        self.record_size = solution_size + mask_size
+        self.metadata = json.dumps(metadata or {}).encode("utf-8")
+
+        code = TechniqueSolver.difficulties.index(difficulty) + 1 if difficulty != None else 0
+
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, box_size, code, self.record_size, len(self.metadata)))
+        self.file.write(self.metadata)
+
+    """add a puzzle and its solution as strings of size * size symbols, 0 marking an empty cell"""
+    def add(self, puzzle, solution):
+        if len(puzzle) != self.box_size ** 4 or len(solution) != self.box_size ** 4:
+            raise ValueError(f'puzzle and solution must have {self.box_size ** 4} cells')
+
+        self.file.write(pack_record(puzzle, solution, self.box_size))
+        self.count += 1
+
+    """add the fresh board and solved board of a SudokuBoard"""
+    def add_board(self, board):
+        self.add(board.fresh_board.to_string(), board.solved_board.to_string())
+
+    """close the file"""
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+"""
+Read only, memory mapped view of an archive file, indexed like a list of (puzzle, solution) strings.
+"""
+class PuzzleArchive():
+    """map the archive at path and read its header"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.box_size, code, self.record_size, metadata_size = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'{path} is not a puzzle archive')
+
+        self.difficulty = TechniqueSolver.difficulties[code - 1] if code else None
+        self.metadata = json.loads(bytes(self.map[HEADER.size:HEADER.size + metadata_size]))
+
+        # records start after the metadata, a partly written last record is left out
+        self.offset = HEADER.size + metadata_size
+        self.count = (len(self.map) - self.offset) // self.record_size
+
+    """puzzle and solution strings of puzzle k, negative k counts from the end"""
+    def __getitem__(self, k):
+        if k < 0:
+            k += self.count
+        if not 0 <= k < self.count:
+            raise IndexError("puzzle archive index out of range")
+
+        start = self.offset + k * self.record_size
+        return unpack_record(self.map[start:start + self.record_size], self.box_size)
+
+    """iterate every (puzzle, solution) pair in order"""
+    def __iter__(self):
+        for k in range(self.count):
+            yield self[k]
+
+    def __len__(self):
+        return self.count
+
+    """puzzle k as a SudokuBoard ready to play or solve"""
+    def load_board(self, k, strategy="mrv", backend="bitmask"):
+        board = SudokuBoard(strategy, backend, self.box_size)
+        board.load_puzzle(*self[k])
+        board.difficulty = self.difficulty
+
+        return board
+
+    """close the mapping and the file"""
+    def close(self):
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+    """reopen the archive by path when sent to another process, the pages stay shared"""
+    def __reduce__(self):
+        return (PuzzleArchive, (self.path,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
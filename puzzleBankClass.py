@@ -0,0 +1,123 @@
+# import sudoku board class and puzzle generator
+from sudokuBoardClass import SudokuBoard
+from batchGenerator import generate_puzzle
+
+# import libraries for the background worker and the puzzle queue
+from collections import deque
+import os, random, threading
+
+"""
+Bank of ready generated puzzles so a new game never waits for generation.
+  * Puzzles are kept in memory as (puzzle, solution) board strings, so popping one is O(1).
+  * A background thread generates new puzzles whenever the bank holds less than depth puzzles.
+  * The bank is loaded from and saved to a file, one "puzzle,solution" line per puzzle,
+    so the next start already has puzzles ready.
+  * Every puzzle in a bank has the same box_size and difficulty, use a separate file for each of them.
+"""
+class PuzzleBank():
+    """load any saved puzzles from path, keeping depth puzzles ready once started"""
+    def __init__(self, path="puzzle_bank.txt", depth=10, strategy="mrv", backend="bitmask", box_size=3,
+                 difficulty=None):
+        self.path = path
+        self.depth = depth
+        self.strategy = strategy
+        self.backend = backend
+        self.box_size = box_size
+        self.difficulty = difficulty
+
+        # ready puzzles and the condition the worker waits on until one is popped
+        self.puzzles = deque()
+        self.condition = threading.Condition()
+        self.worker = None
+        self.running = False
+
+        # separate generator so the worker doesn't share the game's random state
+        self.generator = random.Random()
+
+        self.load()
+
+    """read saved puzzles from the bank file"""
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path) as bank_file:
+            for line in bank_file:
+                line = line.strip()
+                if line:
+                    puzzle, solution = line.split(",")
+
+                    # skip puzzles saved for another board size
+                    if len(puzzle) == self.box_size ** 4:
+                        self.puzzles.append((puzzle, solution))
+
+    """write the ready puzzles to the bank file"""
+    def save(self):
+        with self.condition:
+            puzzles = list(self.puzzles)
+
+        with open(self.path, "w") as bank_file:
+            for puzzle, solution in puzzles:
+                bank_file.write(f'{puzzle},{solution}\n')
+
+    """start the background worker that keeps the bank topped up"""
+    def start(self):
+        if self.worker != None:
+            return
+
+        self.running = True
+        self.worker = threading.Thread(target=self.refill, daemon=True)
+        self.worker.start()
+
+    """stop the background worker and save the ready puzzles"""
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+        if self.worker != None:
+            self.worker.join()
+            self.worker = None
+
+        self.save()
+
+    """background worker, generates puzzles until the bank holds depth puzzles then waits for a pop"""
+    def refill(self):
+        while True:
+            with self.condition:
+                while self.running and len(self.puzzles) >= self.depth:
+                    self.condition.wait()
+
+                if not self.running:
+                    return
+
+                seed = self.generator.randrange(2 ** 32)
+
+            # generate outside the lock so pop never waits on generation
+            puzzle = generate_puzzle(seed, self.strategy, self.backend, self.box_size, self.difficulty)
+
+            with self.condition:
+                self.puzzles.append(puzzle)
+
+    """
+    take a ready puzzle from the bank as a SudokuBoard
+      * returns None if the bank is empty, the caller should generate a board itself
+    """
+    def pop(self):
+        with self.condition:
+            if not self.puzzles:
+                return None
+
+            puzzle, solution = self.puzzles.popleft()
+
+            # wake the worker to replace the puzzle
+            self.condition.notify()
+
+        board = SudokuBoard(self.strategy, self.backend, self.box_size)
+        board.load_puzzle(puzzle, solution)
+
+        return board
+
+    """number of ready puzzles"""
+    def __len__(self):
+        return len(self.puzzles)
@@ -0,0 +1,129 @@
+# import canonical form to find puzzles equivalent to one already seen
+from canonicalForm import canonical_form
+
+# import libraries for fingerprints, the memory mapped table and its header
+import hashlib, mmap, os, struct
+
+"""
+On-disk set of puzzles seen before, up to symmetry, for "have we seen this puzzle" checks.
+  * A puzzle is stored as a 64 bit fingerprint of its canonical form, so a puzzle and every puzzle
+    equivalent to it by relabeling, row, column, band and stack swaps or transposition match.
+  * The file is an open addressing hash table of fingerprints, memory mapped, so a check or an add
+    reads one or two slots whatever the size of the index and nothing is loaded on open.
+  * The table doubles once it is half full. 8 bytes per slot, so a million puzzles take 16 to 32 MB.
+  * Two different puzzles share a fingerprint with a chance of about n * n / 2^65, around 1 in 40000
+    for 10 million puzzles, and the later one is then taken as seen.
+  * One process writes an index at a time.
+
+Usage:
+    with PuzzleIndex("seen.idx") as index:
+        if index.add(puzzle):
+            print("new puzzle")
+"""
+class PuzzleIndex():
+    # file header: magic, slot count and puzzle count, padded to 32 bytes
+    header = struct.Struct("<8sQQ8x")
+    magic = b"SUDOKUIX"
+
+    """open the index at path, creating an empty one with capacity slots if it doesn't exist"""
+    def __init__(self, path, capacity=1 << 16):
+        self.path = path
+
+        if not os.path.exists(path):
+            self.__create(path, capacity)
+
+        self.__open()
+
+    """write an empty table of capacity slots, capacity is rounded up to a power of 2"""
+    def __create(self, path, capacity):
+        capacity = 1 << max(capacity - 1, 1).bit_length()
+
+        with open(path, "wb") as index_file:
+            index_file.write(self.header.pack(self.magic, capacity, 0))
+            index_file.truncate(self.header.size + capacity * 8)
+
+    """map the file and view its slots as unsigned 64 bit ints"""
+    def __open(self):
+        self.file = open(self.path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+        magic, self.capacity, self.count = self.header.unpack_from(self.map)
+        if magic != self.magic:
+            self.map.close()
+            self.file.close()
+            raise ValueError(f'{self.path} is not a puzzle index')
+
+        self.slots = memoryview(self.map)[self.header.size:].cast("Q")
+
+    """64 bit fingerprint of a puzzle's canonical form, never 0 which marks an empty slot"""
+    @staticmethod
+    def fingerprint(puzzle):
+        digest = hashlib.blake2b(canonical_form(puzzle).encode("ascii"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    """slot holding a fingerprint, or the empty slot where it belongs, by linear probing"""
+    def __find(self, fingerprint):
+        mask = self.capacity - 1
+        slot = fingerprint & mask
+        while self.slots[slot] != 0 and self.slots[slot] != fingerprint:
+            slot = (slot + 1) & mask
+
+        return slot
+
+    """True if the puzzle or an equivalent one is in the index"""
+    def __contains__(self, puzzle):
+        return self.slots[self.__find(self.fingerprint(puzzle))] != 0
+
+    """add a puzzle, returns False if it or an equivalent one was already in the index"""
+    def add(self, puzzle):
+        return self.__insert(self.fingerprint(puzzle))
+
+    """add a fingerprint, returns False if it was already in the index"""
+    def __insert(self, fingerprint):
+        slot = self.__find(fingerprint)
+        if self.slots[slot] != 0:
+            return False
+
+        self.slots[slot] = fingerprint
+        self.count += 1
+        self.header.pack_into(self.map, 0, self.magic, self.capacity, self.count)
+
+        # keep the table at most half full so probes stay short
+        if self.count * 2 > self.capacity:
+            self.__grow()
+
+        return True
+
+    """rewrite the table with twice the slots next to the old one, then swap it in"""
+    def __grow(self):
+        path = self.path + ".tmp"
+        if os.path.exists(path):
+            os.remove(path)
+
+        with PuzzleIndex(path, self.capacity * 2) as bigger:
+            for fingerprint in self.slots:
+                if fingerprint != 0:
+                    bigger.__insert(fingerprint)
+
+        self.close()
+        os.replace(path, self.path)
+        self.__open()
+
+    """write the table to disk and close the file"""
+    def close(self):
+        if self.map.closed:
+            return
+
+        self.slots.release()
+        self.map.flush()
+        self.map.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
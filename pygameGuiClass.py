@@ -1,20 +1,35 @@
 
 # import additional classes
-from sudokuBoardClass import SudokuBoard
+from sudokuEngineClass import SudokuEngine
 from buttonClass import Button
+from glyphCacheClass import GlyphCache
+from puzzleBankClass import PuzzleBank
+from compactBoardClass import CompactBoard
 
 # import pygame library for GUI
 import sys, pygame as pg
 
 """
-Class that displays the game GUI and does minor SUDUKO rule checks
+Class that displays the game GUI, the game rules live in the headless SudokuEngine
 """
 class PygameGUI():
-    """initialize pygame"""
-    def __init__(self):
+    """
+    initialize pygame
+      * fps=None sleeps until the next event, a number polls for events at most fps times a second.
+        Either way the window is only redrawn when something on it changes.
+      * box_size sets the board size, 3 for 9 * 9 and 4 for 16 * 16 where digits above 9 are typed as letters.
+      * difficulty ("easy", "medium", "hard" or "expert") picks the difficulty of every puzzle, any by default.
+    """
+    def __init__(self, fps=None, box_size=3, difficulty=None):
         # initialize pygame
         pg.init()
 
+        # initialize render loop
+        self.fps = fps
+        self.clock = pg.time.Clock()
+        self.redraw = True
+        self.dirty_buttons = []
+
         # initialize game window
         self.window_width = 495
         self.window_height = 600
@@ -37,12 +52,24 @@ class PygameGUI():
         self.paleturquoise = [175,238,238]
         self.coral = [255,127,80]
 
-        # initialize game grid
-        self.board = None
-        self.new_board()
-        self.grid_size = 405
+        # initialize the board size
+        self.box_size = box_size
+        self.size = box_size * box_size
+
+        # initialize the bank of ready puzzles, refilled in the background, one bank file per board size and difficulty
+        self.difficulty = difficulty
+        self.bank_path = "puzzle_bank" + (f'_{self.size}' if box_size != 3 else "") \
+                         + (f'_{difficulty}' if difficulty != None else "") + ".txt"
+        self.bank_depth = 10
+        self.puzzle_bank = PuzzleBank(self.bank_path, self.bank_depth, box_size=box_size, difficulty=difficulty)
+        self.puzzle_bank.start()
+
+        # initialize game session and grid, the grid is shrunk to a whole number of cells
+        self.engine = SudokuEngine(self.puzzle_bank, box_size, difficulty)
+        self.engine.board.print_sudoku()
         self.thick_border = 3
-        self.cell_size = int(self.grid_size/9)
+        self.cell_size = int(405/self.size)
+        self.grid_size = self.cell_size * self.size
         self.grid_offset = (self.window_width - self.grid_size)/2
         self.grid_position = (self.grid_offset, self.grid_offset)
         self.thick_border_color = self.lightblue
@@ -60,8 +87,14 @@ class PygameGUI():
         self.playing_buttons = []
         self.play_again = []
 
-        # initialize font
-        self.font = pg.font.SysFont("arial", int(self.cell_size/2))
+        # initialize fonts once, text rendered with them is cached
+        self.font_size = int(self.cell_size/2)
+        self.font = GlyphCache.font("arial", self.font_size)
+        self.title_font_size = 35
+        GlyphCache.font("arial", self.title_font_size, bold=True)
+
+        # font used for the button labels in Button.display_text
+        GlyphCache.font("arial", 15, bold=True)
         self.default_font_color = self.black
         self.hint_font_color = self.lime
         self.solved_font_color = self.magenta
@@ -69,17 +102,11 @@ class PygameGUI():
         self.button_on_font_color = self.white
 
         # initialize state flags
-        self.cells_locked = []
         self.cell_selected = None
         self.mouse_position = None
         self.game_state = "playing"
-        self.complete = False
         self.win = False
         self.cell_changed = False
-        self.incorrect_cells = []
-        self.correct_cells = []
-        self.solved_cells = []
-        self.hint_cell = None
 
         # initialize game win
         self.win_circle_color = self.coral
@@ -95,21 +122,42 @@ class PygameGUI():
     def run(self):
         while self.running:
             if self.game_state == "playing":
-                self.playing_events()
+                # with nothing to redraw, sleep until the next event
+                if self.fps == None and not self.redraw and not self.dirty_buttons:
+                    events = [pg.event.wait()] + pg.event.get()
+                else:
+                    events = pg.event.get()
+
+                self.playing_events(events)
                 self.playing_update()
                 self.playing_display()
+
+                # cap the frame rate when polling
+                if self.fps != None:
+                    self.clock.tick(self.fps)
+        self.puzzle_bank.stop()
         pg.quit()
         sys.exit()
 
-    """event listener during playing state"""
-    def playing_events(self):
+    """event listener during playing state, handles events or the pending pygame events"""
+    def playing_events(self, events=None):
         # listening for quit event
-        for event in pg.event.get():
+        for event in (events if events != None else pg.event.get()):
             if event.type == pg.QUIT:
                 self.running = False
 
+            # redraw the whole window when it is uncovered
+            if event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+                self.redraw = True
+
             # listening for left click event
             if event.type == pg.MOUSEBUTTONDOWN:
+                # every click can change the board or a button, so redraw the window
+                self.redraw = True
+
+                # use the click position and bring the button hover state up to date with it
+                self.mouse_position = event.pos
+                self.update_hover()
 
                 # find cell selected
                 cell_selected = self.mouse_in_cell()
@@ -131,31 +179,23 @@ class PygameGUI():
 
                     # remove hint cell when hint untoggled
                     if self.playing_buttons[1].toggle == False:
-                        self.hint_cell = False
+                        self.engine.hint_cell = None
 
             # User types an input
             if event.type == pg.KEYDOWN:
+                self.redraw = True
 
                 # only allow input in non locked cells
-                if self.cell_selected != None and self.cell_selected not in self.cells_locked:
-
-                    # allow inputs 1 to 9
-                    if self.is_integer(event.unicode) and int(event.unicode) != 0:
-
-                        # set player board cell value to input
-                        self.board.player_board[self.cell_selected[0]][self.cell_selected[1]] = int(event.unicode)
-
-                        # check if the cell is correct or not
-                        self.check_cells()
+                if self.cell_selected != None and self.cell_selected not in self.engine.cells_locked:
 
-                        self.remove_solved_cells()
+                    # allow inputs 1 to size
+                    if self.digit_value(event.unicode) != None:
 
-                        # check if board complete is now true
-                        self.board_complete()
+                        # set player board cell value to input, the engine checks the board
+                        self.engine.set_cell(self.cell_selected[0], self.cell_selected[1], self.digit_value(event.unicode))
 
                         # toggle hint button off when change is made
                         self.playing_buttons[1].toggle = False
-                        self.hint_cell = None
 
                         # flag that a cell has changed
                         self.cell_changed = True
@@ -163,18 +203,11 @@ class PygameGUI():
                     # allow user to clear input
                     elif event.key == pg.K_DELETE or event.key == pg.K_BACKSPACE:
 
-                        # set player board cell value to None
-                        self.complete = False
-                        self.board.player_board[self.cell_selected[0]][self.cell_selected[1]] = None
-
-                        # call cell check to remove from incorrect array if in array
-                        self.check_cells()
-
-                        self.remove_solved_cells()
+                        # set player board cell value to None, the engine checks the board
+                        self.engine.clear_cell(self.cell_selected[0], self.cell_selected[1])
 
                         # toggle hint button off when change is made
                         self.playing_buttons[1].toggle = False
-                        self.hint_cell = None
 
                         # flag that a cell has changed
                         self.cell_changed = True
@@ -184,23 +217,41 @@ class PygameGUI():
         # get the current mouse position
         self.mouse_position = pg.mouse.get_pos()
 
-        # check if mouse is hovering over button
-        if self.win == False:
-            for button in self.playing_buttons:
-                button.update(self.mouse_position)
-        else:
-            for button in self.play_again:
-                button.update(self.mouse_position)
+        self.update_hover()
+
+    """check if mouse is hovering over button, buttons that change hover state need to be redrawn"""
+    def update_hover(self):
+        buttons = self.playing_buttons if self.win == False else self.play_again
+
+        for button in buttons:
+            if button.update(self.mouse_position) and button not in self.dirty_buttons:
+                self.dirty_buttons.append(button)
 
 
     """
     Functions to display the board as game is running
     """
 
-    """generate a display window for game"""
+    """
+    generate a display window for game
+      * the whole window is redrawn only after a click, key press or uncover,
+        a hover change only redraws and updates the rectangle of its button
+    """
     def playing_display(self):
-        # set background to white
-        self.window.fill(self.white)
+        if not self.redraw:
+            # redraw only the buttons whose hover state changed
+            if self.dirty_buttons:
+                for button in self.dirty_buttons:
+                    button.draw(self.window)
+                pg.display.update([button.rectangle for button in self.dirty_buttons])
+                self.dirty_buttons = []
+            return
+
+        self.redraw = False
+        self.dirty_buttons = []
+
+        # pre-rendered white background, title and locked cell shading
+        self.window.blit(self.background_layer, (0, 0))
 
         if self.win == False:
             # display each button in button array
@@ -210,17 +261,11 @@ class PygameGUI():
             for button in self.play_again:
                 button.draw(self.window)
 
-        # display locked cell over grid
-        self.display_locked_cells()
-
         # display incorrect cells
         self.display_wrong_cells()
 
-        # display grid over shaded cells
-        self.display_grid()
-
-        # display title over grid
-        self.display_title()
+        # display pre-rendered grid over shaded cells
+        self.window.blit(self.grid_layer, (0, 0))
 
         # display selected cell over locked cell
         if self.win == False:
@@ -230,49 +275,56 @@ class PygameGUI():
         # display numbers over selected cell
         self.display_numbers()
 
-        # display win
-        if self.incorrect_cells == [] and self.complete == True and self.playing_buttons[2].toggle == True:
+        # display win, the next frame shows the play again button
+        if self.engine.is_won() and self.playing_buttons[2].toggle == True:
+            if self.win == False:
+                self.redraw = True
             self.display_win()
 
         # update the display
         pg.display.update()
 
-    """draw the grid on display screen"""
-    def display_grid(self):
+    """draw the grid on surface, the display screen by default"""
+    def display_grid(self, surface=None):
+        if surface == None:
+            surface = self.window
+
         # set grid position, size, and outer border
-        pg.draw.rect(self.window, self.thick_border_color, (self.grid_position[0], self.grid_position[1], self.window_width -
+        pg.draw.rect(surface, self.thick_border_color, (self.grid_position[0], self.grid_position[1], self.window_width -
                                             (self.window_width - self.grid_size), self.window_height -
                                             (self.window_height - self.grid_size)), self.thick_border)
 
         # draw each cell
-        for i in range(9):
+        for i in range(self.size):
 
             # make inner lines thin
-            if i % 3 != 0:
+            if i % self.box_size != 0:
 
                 # inner columns
-                pg.draw.line(self.window, self.thin_border_color, (self.grid_position[0] + (i * self.cell_size), self.grid_position[1]),
+                pg.draw.line(surface, self.thin_border_color, (self.grid_position[0] + (i * self.cell_size), self.grid_position[1]),
                                 (self.grid_position[0] + (i * self.cell_size), self.grid_position[1] + self.grid_size))
 
                 # inner rows
-                pg.draw.line(self.window, self.thin_border_color, (self.grid_position[0], self.grid_position[1] + (i * self.cell_size)),
+                pg.draw.line(surface, self.thin_border_color, (self.grid_position[0], self.grid_position[1] + (i * self.cell_size)),
                                  (self.grid_position[1] + self.grid_size, self.grid_position[1] + (i * self.cell_size)))
 
             # make sub-grid lines thick
             else:
                 # sub-grid columns
-                pg.draw.line(self.window, self.thick_border_color, (self.grid_position[0] + (i * self.cell_size), self.grid_position[1]),
+                pg.draw.line(surface, self.thick_border_color, (self.grid_position[0] + (i * self.cell_size), self.grid_position[1]),
                              (self.grid_position[0] + (i * self.cell_size), self.grid_position[1] + self.grid_size), self.thick_border)
 
                 # sub-grid rows
-                pg.draw.line(self.window, self.thick_border_color, (self.grid_position[0], self.grid_position[1] + (i * self.cell_size)),
+                pg.draw.line(surface, self.thick_border_color, (self.grid_position[0], self.grid_position[1] + (i * self.cell_size)),
                              (self.grid_position[1] + self.grid_size, self.grid_position[1] + (i * self.cell_size)), self.thick_border)
 
-    """display window title text"""
-    def display_title(self):
-        # initialize font
-        font = pg.font.SysFont("arial", 35, bold=1)
-        text = font.render("SUDOKU", False, self.black)
+    """display window title text on surface, the display screen by default"""
+    def display_title(self, surface=None):
+        if surface == None:
+            surface = self.window
+
+        # cached title text
+        text = GlyphCache.render("arial", self.title_font_size, "SUDOKU", self.black, bold=True)
 
         # determine text size
         text_width, text_height = text.get_size()
@@ -282,12 +334,12 @@ class PygameGUI():
         y_cordinate = int((self.grid_offset - text_height) / 2)
 
         # display text on screen
-        self.window.blit(text, (x_cordinate, y_cordinate))
+        surface.blit(text, (x_cordinate, y_cordinate))
 
     """highlight the select cell"""
     def draw_selected(self):
         # Only allow non locked cells to be selected.
-        if self.cell_selected not in self.cells_locked:
+        if self.cell_selected not in self.engine.cells_locked:
             pg.draw.rect(self.window, self.cell_selected_color, ((self.cell_selected[1] * self.cell_size) + self.grid_position[0],
                                                                 (self.cell_selected[0] * self.cell_size) + self.grid_position[0],
                                                                 self.cell_size, self.cell_size), 3)
@@ -313,7 +365,7 @@ class PygameGUI():
         column_clicked = int((self.mouse_position[0] - self.grid_position[1])//self.cell_size)
 
         # return cell index clicked
-        return ([row_clicked, column_clicked])
+        return (row_clicked, column_clicked)
 
     """create button objects"""
     def create_buttons(self):
@@ -356,7 +408,7 @@ class PygameGUI():
 
     """display text on screen"""
     def display_digit(self, digit, position, font_color):
-        font = self.font.render(digit, False, font_color)
+        font = GlyphCache.render("arial", self.font_size, digit, font_color)
         font_height = font.get_height()
         font_width = font.get_width()
 
@@ -368,79 +420,82 @@ class PygameGUI():
     """display numbers on screen"""
     def display_numbers(self):
         # iterate through the generated suduko board.
-        for i in range(9):
-            for j in range(9):
+        for i in range(self.size):
+            for j in range(self.size):
 
                 # use player board so we can see new numbers input
-                number = self.board.player_board[i][j]
+                number = self.engine.board.player_board[i][j]
 
                 # hint derives form solved board
-                hint = self.board.solved_board[i][j]
+                hint = self.engine.board.solved_board[i][j]
 
                 # skip None from player board, display hint from solved board, display solved in blue
-                if number != None or [i,j] == self.hint_cell:
+                if number != None or (i, j) == self.engine.hint_cell:
 
                     # determine cell the number will be displayed in
                         # first index pegs to a column, second index pegs to a row
                     cell_position = [(j * self.cell_size) + self.grid_position[0],
                                      (i * self.cell_size) + self.grid_position[1]]
 
-                    if [i,j] == self.hint_cell:
+                    if (i, j) == self.engine.hint_cell:
                         if number != None:
-                            self.display_digit(str(number), cell_position, self.default_font_color)
-                        self.display_digit(str(hint), cell_position, self.hint_font_color)
-                    elif [i,j] in self.solved_cells:
-                        self.display_digit(str(number), cell_position, self.solved_font_color)
+                            self.display_digit(CompactBoard.symbols[number], cell_position, self.default_font_color)
+                        self.display_digit(CompactBoard.symbols[hint], cell_position, self.hint_font_color)
+                    elif (i, j) in self.engine.solved_cells:
+                        self.display_digit(CompactBoard.symbols[number], cell_position, self.solved_font_color)
                     else:
-                        self.display_digit(str(number), cell_position, self.default_font_color)
+                        self.display_digit(CompactBoard.symbols[number], cell_position, self.default_font_color)
+
+    """shade locked cells on surface, the display screen by default"""
+    def display_locked_cells(self, surface=None):
+        if surface == None:
+            surface = self.window
 
-    """shade locked cells"""
-    def display_locked_cells(self):
-        for cell in self.cells_locked:
+        for cell in self.engine.cells_locked:
 
             # shade locked cells containing provided hints
-            pg.draw.rect(self.window, self.cell_locked_color, ((cell[1] * self.cell_size) + self.grid_position[0],
+            pg.draw.rect(surface, self.cell_locked_color, ((cell[1] * self.cell_size) + self.grid_position[0],
                                                                (cell[0] * self.cell_size) + self.grid_position[1],
                                                                self.cell_size, self.cell_size))
 
-    """check if user keyboard input is integer"""
-    def is_integer(self, input):
-        # if there is an error converting our input string to integer, return false
-        try:
-            int(input)
-            return True
-        except:
-            return False
+    """digit typed by the user, 1 to 9 then A for 10 and so on, None if it isn't a digit of this board"""
+    def digit_value(self, input):
+        # only single characters can be digits
+        if len(input) != 1:
+            return None
+
+        digit = CompactBoard.symbols.find(input.upper())
+        if digit < 1 or digit > self.size:
+            return None
 
-    """helper function for creating buttons"""
+        return digit
+
+    """helper function for creating buttons and the pre-rendered board layers"""
     def load(self):
         self.create_buttons()
-        self.flag_locked_cells()
 
-    """add locked cells to locked cells array"""
-    def flag_locked_cells(self):
-        # iterate original board
-        for i in range(9):
-            for j in range(9):
-                number = self.board.fresh_board[i][j]
+        # grid lines only depend on the window size, so they are drawn once on a transparent layer
+        self.grid_layer = pg.Surface((self.window_width, self.window_height), pg.SRCALPHA)
+        self.display_grid(self.grid_layer)
+
+        self.render_background()
 
-                # lock cells containing provided hints
-                if number != None:
-                    self.cells_locked.append([i,j])
+    """pre-render the background, title and locked cell shading, only changes when a puzzle loads"""
+    def render_background(self):
+        self.background_layer = pg.Surface((self.window_width, self.window_height))
+        self.background_layer.fill(self.white)
+        self.display_locked_cells(self.background_layer)
+        self.display_title(self.background_layer)
 
     """when user requests, display hint"""
     def display_hint(self):
-        # iterate array to determine the hint cell to be shown
-        for i in range(9):
-            for j in range(9):
-                if self.board.player_board[i][j] == None or [i,j] in self.incorrect_cells:
-                    self.hint_cell = [i,j]
-                    return
+        # the engine picks the hint cell to be shown
+        self.engine.hint()
 
     """
     this button solves the board
         * Please note that the puzzle solving logic is in "sudokuBoardClass.py"
-            in order to avoid duplicate code, this function is simply checking 
+            in order to avoid duplicate code, the engine is simply checking
             against a copy of the solved puzzle.
     """
     def solve_board(self):
@@ -448,87 +503,39 @@ class PygameGUI():
         self.playing_buttons[1].toggle = False
         self.playing_buttons[2].toggle = False
 
-        # iterate array
-        for i in range(9):
-            for j in range(9):
-
-                #skip locked cells, correct cells, solved cells
-                if [i,j] not in self.cells_locked \
-                        and [i,j] not in self.solved_cells\
-                        and self.board.player_board[i][j] != self.board.solved_board[i][j]:
-
-                    # input correct values
-                    self.board.player_board[i][j] = self.board.solved_board[i][j]
-
-                    # add cell to solved cells array
-                    self.solved_cells.append([i, j])
-
-                    # remove incorrect cells from array
-                    if [i,j] in self.incorrect_cells:
-                        self.incorrect_cells.remove([i,j])
-
-                    # add correct cells to array
-                    if [i, j] not in self.correct_cells and [i,j] not in self.cells_locked:
-                        self.correct_cells.append([i, j])
-
-
-        # check that board is complete
-        self.board_complete()
-
-    """if cell is deleted or changed remove cell from solved"""
-    def remove_solved_cells(self):
-        if self.cell_selected in self.solved_cells:
-            self.solved_cells.remove(self.cell_selected)
+        # input correct values in blank or incorrect cells
+        self.engine.solve()
 
     """erase all user input"""
     def reset_board(self):
         # re-initialize playing states
         self.cell_selected = None
-        self.complete = False
         self.win = False
         self.cell_changed = False
-        self.incorrect_cells = []
-        self.correct_cells = []
-        self.solved_cells = []
-        self.hint_cell = None
 
         # re-initialize button toggles
         for button in self.playing_buttons:
             button.toggle = False
 
-        # iterate unlocked cells and set them to None
-        for i in range(9):
-           for j in range(9):
-               if [i,j] not in self.cells_locked:
-                   self.board.player_board[i][j] = None
+        # set unlocked cells to None
+        self.engine.reset()
+        self.render_background()
 
     """generate a unique and valid board with a single solution"""
     def new_board(self):
         # initialize new game
-        self.cells_locked = []
         self.cell_selected = None
         self.mouse_position = None
         self.game_state = "playing"
-        self.complete = False
         self.win = False
         self.cell_changed = False
-        self.incorrect_cells = []
-        self.correct_cells = []
-        self.solved_cells = []
-        self.hint_cell = None
 
-        # generate new board
-        self.board = SudokuBoard()
-        self.board.fill_board()
-        self.board.save_solved_board()
-        self.board.remove_clues()
-        self.board.save_fresh_board()
-
-        # initialize locked cells
-        self.flag_locked_cells()
+        # take a board from the puzzle bank or generate a new one
+        self.engine.new()
+        self.render_background()
 
         # print new board to console
-        self.board.print_sudoku()
+        self.engine.board.print_sudoku()
 
 
 
@@ -536,126 +543,28 @@ class PygameGUI():
      Functions to verify user solutions
     """
 
-    """check if the board is complete"""
-    def board_complete(self):
-        # iterate board to ensure no cells contain None
-        for i in range(9):
-            for j in range(9):
-                if self.board.player_board[i][j] == None:
-
-                    #set complete flag to false
-                    self.complete = False
-                    return False
-
-        # set complete flag to true
-        self.complete = True
-        return True
-
     """on each user input, highlight all user input cells breaking sudoku rule set"""
     def check_cells(self):
         # reset hint toggle
         self.playing_buttons[1].toggle = False
 
-        # iterate entire grid:
-        for row in range(9):
-            for column in range(9):
-
-                # don't evaluate or change locked cells
-                if [row, column] not in self.cells_locked:
-
-                    #  If cell is not none, check if incorrect.
-                    if self.board.player_board[row][column] != None:
-
-                        # check if input is incorrect
-                        if self.check_row(row,column) == False or \
-                                self.check_column(row,column) == False or \
-                                self.check_sub_grid(row,column) == False:
-
-                            # if cell not in incorrect array, add it
-                            if [row,column] not in self.incorrect_cells:
-                                self.incorrect_cells.append([row, column])
-
-                            # if cell in correct array, remove it
-                            if [row,column] in self.correct_cells:
-                                self.correct_cells.remove([row, column])
-
-                        # if new input is correct
-                        else:
-                            # if cell in incorrect array, remove it
-                            if [row, column] in self.incorrect_cells:
-                                self.incorrect_cells.remove([row, column])
-
-                            # if cell not in correct array, add it
-                            if [row, column] not in self.correct_cells:
-                                self.correct_cells.append([row, column])
-
-                    # If cell is now None, remove from incorrect array and correct array.
-                    else:
-                        if [row, column] in self.incorrect_cells:
-                            self.incorrect_cells.remove([row, column])
-
-                        if [row, column] in self.correct_cells:
-                            self.correct_cells.remove([row, column])
-
-    """determines if player placement is valid within row"""
-    def check_row(self, row, column):
-        # iterate the columns in the row, skip current column
-        for col in range(9):
-
-            # skip the current cell column
-            if col != column:
-
-                # if player input exists in row, return false
-                if self.board.player_board[row][col] == self.board.player_board[row][column]:
-                    return False
-        return True
-
-    """determines if player placement is valid within column"""
-    def check_column(self, row, column):
-        # iterate the rows in the column, skip current row
-        for r in range(9):
-
-            # skip the current cell row
-            if r != row:
-
-                # if player input value exists in column, return false
-                if self.board.player_board[r][column] == self.board.player_board[row][column]:
-                    return False
-        return True
-
-    """determines if player placement is valid within subgrid"""
-    def check_sub_grid(self, row, column):
-        # determine the particular sub-grid on the sudoku board
-        sub_grid_row = (row // 3) * 3
-        sub_grid_col = (column // 3) * 3
-
-        # check if num is in current sub grid
-        for r in range(3):
-            for col in range(3):
-
-                # skip input cell
-                if (sub_grid_row + r) != row and (sub_grid_col + col) != column:
-
-                    # if player input exists in sub-grid return false
-                    if self.board.player_board[sub_grid_row + r][sub_grid_col + col] == self.board.player_board[row][column]:
-                        return False
-        return True
+        self.engine.check()
 
     """shade incorrect cells cells"""
     def display_wrong_cells(self):
         # only display incorrect cells if the check button is toggled on
         if self.playing_buttons[2].toggle == True:
-            for cell in self.incorrect_cells:
+            for cell in self.engine.incorrect_cells:
 
                 # shade incorrect cells
                 pg.draw.rect(self.window, self.cell_wrong_color, ((cell[1] * self.cell_size) + self.grid_position[0],
                                                                     (cell[0] * self.cell_size) + self.grid_position[1],
                                                                     self.cell_size, self.cell_size))
 
-            for cell in self.correct_cells:
+            for cell in self.engine.correct_cells:
 
                 # shade correct cells only
-                if self.complete == False or self.incorrect_cells != []:
+                if self.engine.complete == False or self.engine.incorrect_cells:
                     pg.draw.rect(self.window, self.cell_correct_color, ((cell[1] * self.cell_size) + self.grid_position[0],
                                                                     (cell[0] * self.cell_size) + self.grid_position[1],
                                                                     self.cell_size, self.cell_size))
@@ -668,9 +577,8 @@ class PygameGUI():
         pg.draw.circle(self.window, self.win_circle_color, (int((self.grid_size/2) + int(self.grid_offset)),
                                             int((self.grid_size/2) + int(self.grid_offset))),int(self.window_width/4))
 
-        # initialize font
-        font = pg.font.SysFont("arial", 35, bold=1)
-        text = font.render("You Win!", False, self.white)
+        # cached win text
+        text = GlyphCache.render("arial", self.title_font_size, "You Win!", self.white, bold=True)
 
         # determine text size
         text_width, text_height = text.get_size()
@@ -0,0 +1,161 @@
+# import libraries for timing phases, wrapping methods and profiling
+import cProfile, functools, time
+from contextlib import contextmanager, ExitStack
+
+"""
+Opt-in record of the work done by a SudokuBoard, per phase.
+  * A phase is one call of fill_board, remove_clues, count_solutions, find_solutions, solve or grade.
+    Each phase keeps its calls, wall time, search nodes, backtracks, digits placed by propagation,
+    deepest search depth, legality checks and uniqueness checks.
+  * Legality checks count SudokuBoard.is_legal calls and the candidate tests of the solver
+    backends: a cell's candidate mask computed by CandidateEngine, or a constraint column compared
+    by DancingLinks while choosing where to branch.
+  * Phases nest: generate holds fill_board, remove_clues and grade phases, and remove_clues
+    grading to a difficulty holds a grade phase per clue. Wall times include nested phases while
+    search counters are only recorded on the phase that ran the search.
+  * remove_clues runs its uniqueness searches itself, on an engine kept through the removal pass,
+    so their nodes, backtracks, propagations and depth are recorded on the remove_clues phase
+    along with its uniqueness checks, not as count_solutions phases.
+  * Hooks are callables taking a phase name and returning a context manager, entered around every
+    phase, so cProfile (see ProfileHook) or a custom tracer can be attached to any phase.
+  * A board without stats (the default) skips all of this, a phase costs one None check.
+
+Usage:
+    stats = SearchStats()
+    board = SudokuBoard(stats=stats)
+    board.generate(seed)
+    print(stats.to_dict())
+"""
+class SearchStats():
+    """start with no recorded phases, hooks are added with add_hook"""
+    def __init__(self, hooks=None):
+        self.phases = {}
+        self.hooks = list(hooks) if hooks != None else []
+
+        # phases being run, innermost last
+        self.active = []
+
+    """add a hook, a callable taking a phase name and returning a context manager"""
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    """record of a phase, created on first use"""
+    def record(self, name):
+        if name not in self.phases:
+            self.phases[name] = PhaseStats(name)
+
+        return self.phases[name]
+
+    """the innermost phase being run, search counters are added to it"""
+    def current(self):
+        return self.active[-1] if self.active else self.record("other")
+
+    """time a phase and run every hook around it"""
+    @contextmanager
+    def phase(self, name):
+        record = self.record(name)
+        self.active.append(record)
+
+        with ExitStack() as hooks:
+            for hook in self.hooks:
+                hooks.enter_context(hook(name))
+
+            start = time.perf_counter()
+            try:
+                yield record
+            finally:
+                record.seconds += time.perf_counter() - start
+                record.calls += 1
+                self.active.pop()
+
+    """add the counters of a finished search by a solver backend to the current phase"""
+    def add_search(self, engine):
+        record = self.current()
+        record.nodes += engine.nodes
+        record.backtracks += engine.backtracks
+        record.propagations += engine.propagations
+        record.max_depth = max(record.max_depth, engine.max_depth)
+        record.legality_checks += engine.legality_checks
+
+    """forget every recorded phase"""
+    def reset(self):
+        self.phases = {}
+
+    """every phase as a JSON ready dict"""
+    def to_dict(self):
+        return {name: record.to_dict() for name, record in self.phases.items()}
+
+
+"""
+Counters of one phase.
+"""
+class PhaseStats():
+    __slots__ = ("name", "calls", "seconds", "nodes", "backtracks", "propagations", "max_depth",
+                 "legality_checks", "uniqueness_checks")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.nodes = 0
+        self.backtracks = 0
+        self.propagations = 0
+        self.max_depth = 0
+        self.legality_checks = 0
+        self.uniqueness_checks = 0
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != "name"}
+
+    def __repr__(self):
+        return f'PhaseStats({self.name}, {self.to_dict()})'
+
+
+"""
+Hook profiling phases with cProfile.
+  * phases limits profiling to the named phases, None profiles every phase.
+  * Nested phases are profiled once, by the outermost profiled phase.
+"""
+class ProfileHook():
+    def __init__(self, phases=None):
+        self.phases = phases
+        self.profile = cProfile.Profile()
+        self.depth = 0
+
+    @contextmanager
+    def __call__(self, name):
+        if self.phases != None and name not in self.phases:
+            yield
+            return
+
+        self.depth += 1
+        if self.depth == 1:
+            self.profile.enable()
+        try:
+            yield
+        finally:
+            if self.depth == 1:
+                self.profile.disable()
+            self.depth -= 1
+
+    """print the profile, sorted by cumulative time by default"""
+    def print_stats(self, sort="cumulative"):
+        self.profile.print_stats(sort)
+
+
+"""
+decorate a SudokuBoard method as a phase, timed when the board has stats and called directly when not
+"""
+def stats_phase(name):
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.stats == None:
+                return method(self, *args, **kwargs)
+
+            with self.stats.phase(name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
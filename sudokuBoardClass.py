@@ -2,6 +2,22 @@
 # import colors class to enable colors to console
 from consoleColorsClass import ConsoleColors
 
+# import bitmask and dancing links solver backends for generating and solving boards
+from candidateEngineClass import CandidateEngine
+from dancingLinksClass import DancingLinks
+
+# import compact board type used for every board state
+from compactBoardClass import CompactBoard
+
+# import logical solver to grade the difficulty of puzzles
+from techniqueSolverClass import TechniqueSolver
+
+# import uniqueness memo to skip checks of boards already checked
+from uniquenessMemoClass import UniquenessMemo
+
+# import phase decorator for the opt-in search stats
+from searchStatsClass import stats_phase
+
 # import random library to create random sudoku board
 import random
 
@@ -9,56 +25,123 @@ import random
 Generates random, valid, single solution SUDOKU puzzles and solves them.
 """
 class SudokuBoard():
-    """save player board, solved board, and fresh board states."""
-    def __init__(self):
+    __slots__ = ("player_board", "solved_board", "fresh_board", "solutions", "strategy", "backend",
+                 "box_size", "size", "nodes", "backtracks", "uniqueness_checks", "difficulty", "stats")
+
+    # clues removed by default for each box size, larger boards keep a larger share of their clues
+    # as the last few removals cost more search than every earlier one together
+    default_removals = {2: 10, 3: 54, 4: 144, 5: 300}
+
+    # most clues removed on a 9 * 9 board when generating to a difficulty, scaled for other board sizes
+    difficulty_removals = {"easy": 45, "medium": 56, "hard": 58, "expert": 64}
+
+    # uniqueness of boards checked by remove_clues, shared by every board and thread in the process
+    uniqueness_memo = UniquenessMemo()
+
+    """
+    save player board, solved board, and fresh board states as compact boards.
+      * strategy selects how solutions are searched for: "ordered" or "mrv" (see CandidateEngine.count_solutions),
+        a strategy passed is always used as given, None picks "ordered" for boards up to 9 * 9 and "mrv" for
+        larger ones, which an ordered search can't fill
+      * backend selects the solver: "bitmask" (CandidateEngine) or "dlx" (DancingLinks)
+      * box_size is the size of a sub-grid, the board has box_size * box_size rows and columns:
+        2 for 4 * 4, 3 for 9 * 9, 4 for 16 * 16 and 5 for 25 * 25
+      * stats is an optional SearchStats recording the work done by every phase, None records nothing
+    """
+    def __init__(self, strategy=None, backend="bitmask", box_size=3, stats=None):
+        self.box_size = box_size
+        self.size = box_size * box_size
         self.player_board = self.__create_board()
-        self.solved_board = []
-        self.fresh_board = []
+        self.solved_board = self.__create_board()
+        self.fresh_board = self.__create_board()
         self.solutions = 0
+        self.strategy = strategy if strategy != None else "mrv" if box_size > 3 else "ordered"
+        self.backend = backend
 
-    """initialize the n * n board"""
-    def __create_board(self):
-        board = []
-        for i in range(9):
-            board.append([None] * 9)
+        self.stats = stats
 
-        return board
+        # search nodes visited and dead ends hit by the last fill_board, solve, find_solutions or remove_clues call
+        self.nodes = 0
+        self.backtracks = 0
 
-    """initial generation of a random board"""
-    def fill_board(self):
-        # get the next empty cell to guess
-        row, column = self.next_cell()
+        # solution counts run by the last remove_clues call
+        self.uniqueness_checks = 0
 
-        choices = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+        # difficulty of the player board after the last remove_clues or grade call
+        self.difficulty = None
 
-        # check if the puzzle has been completed
-        if row == None:
+    """initialize the n * n board"""
+    def __create_board(self):
+        return CompactBoard(size=self.size)
+
+    """load a copy of the player board into the selected solver backend"""
+    def create_engine(self):
+        if self.backend == "dlx":
+            return DancingLinks(self.player_board, self.box_size)
+        elif self.backend == "bitmask":
+            return CandidateEngine(self.player_board, self.box_size)
+        else:
+            raise ValueError(f'unknown solver backend "{self.backend}"')
+
+    """
+    initial generation of a random board
+      * seed makes the board reproducible, None uses the shared random generator.
+    """
+    @stats_phase("fill_board")
+    def fill_board(self, seed=None):
+        # load the board into the solver backend
+        engine = self.create_engine()
+
+        # fill every empty cell with random legal digits
+        generator = random.Random(seed) if seed != None else random
+        filled = engine.fill_board(generator, self.strategy)
+        self.nodes = engine.nodes
+        self.backtracks = engine.backtracks
+        if self.stats != None:
+            self.stats.add_search(engine)
+
+        if filled:
+            engine.write_board(self.player_board)
             return True
 
-        # make a random choice for current cell
-        random.shuffle(choices)
-        for choice in choices:
-
-            # check if it is a legal choice
-            if self.is_legal(row, column, choice):
-                self.player_board[row][column] = choice
-
-                # continue filling board with recursive call.
-                if self.fill_board():
-                    return True
-
-            # if there were no legal moves in this cell, set it to none (back tracking)
-            self.player_board[row][column] = None
-
         return
 
+    """
+    generate a new puzzle: fill an empty board, save it as the solved board, remove clues and save the fresh board
+      * seed makes the puzzle reproducible, None uses the shared random generator.
+      * difficulty generates a puzzle of that difficulty. Clue removal rejects any removal that makes
+        the board too hard as it goes, a new board is only filled when a removal pass runs out of
+        clues while the puzzle is still too easy.
+      * raises a ValueError for a difficulty no puzzle of the board size has, which would never be
+        generated, see TechniqueSolver.difficulties_for
+    """
+    @stats_phase("generate")
+    def generate(self, seed=None, difficulty=None):
+        if difficulty != None and difficulty not in TechniqueSolver.difficulties_for(self.box_size):
+            raise ValueError(f'no {self.size} * {self.size} puzzle is "{difficulty}"')
+
+        generator = random.Random(seed) if seed != None else random
+
+        while True:
+            # seeds of the filled board and the clue removal order
+            seed = generator.randrange(2 ** 32)
+
+            self.player_board = self.__create_board()
+            self.fill_board(seed)
+            self.save_solved_board()
+            self.remove_clues(seed, difficulty=difficulty)
+            self.save_fresh_board()
+
+            if difficulty == None or self.difficulty == difficulty:
+                return True
+
     """check if there are any un-filled cells"""
     def next_cell(self):
         # iterate rows
-        for i in range(9):
+        for i in range(self.size):
 
             # iterate columns
-            for j in range(9):
+            for j in range(self.size):
 
                 # check values of cells
                 if self.player_board[i][j] == None:
@@ -69,118 +152,286 @@ class SudokuBoard():
 
     """checks the legality of each guess"""
     def is_legal(self, row, col, num):
+        if self.stats != None:
+            self.stats.current().legality_checks += 1
+
         # check if num is in current row
-        for i in range(9):
+        for i in range(self.size):
             if self.player_board[row][i] == num:
                 return False
 
         # check if num is in current column
-        for i in range(9):
+        for i in range(self.size):
             if self.player_board[i][col] == num:
                 return False
 
-        # determine the "sub grid" row and column on a 3 by 3 grid of sub grids
-        sub_grid_row = (row // 3) * 3
-        sub_grid_col = (col // 3) * 3
+        # determine the "sub grid" row and column on a box size by box size grid of sub grids
+        sub_grid_row = (row // self.box_size) * self.box_size
+        sub_grid_col = (col // self.box_size) * self.box_size
 
         # check if num is in current sub grid
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.box_size):
+            for j in range(self.box_size):
                 # check the value of each cell within the sub grid
                 if self.player_board[sub_grid_row + i][sub_grid_col + j] == num:
                     return False
         return True
 
-    """save a copy of the full board as solved board for reference to later"""
+    """save a read only copy of the full board as solved board for reference to later"""
     def save_solved_board(self):
-
-        # create empty rows
-        for i in range(9):
-            self.solved_board.append([])
-
-            # insert column values into each row
-            for j in range(9):
-                self.solved_board[i].append(self.player_board[i][j])
+        self.solved_board = self.player_board.freeze()
 
         return
 
-    """remove 54 clues for valid sudoku board"""
-    def remove_clues(self):
+    """
+    remove 54 clues for valid sudoku board
+      * every cell is visited once, in a shuffled order. A clue that can't be removed stays required
+        as more clues are removed, so it is never tried again.
+      * seed makes the removal order reproducible, None uses the shared random generator.
+      * removals is how many clues to remove, None removes the default_removals for the box size
+        (54 on a 9 * 9 board leaving 27, 144 on a 16 * 16 board leaving 112).
+      * if the shuffled pass runs out of removable clues first, more clues are left.
+      * the board had a single solution before a clue is removed, so it still has one unless another
+        digit in that cell leads to a solution. Only those digits are searched, which prunes much
+        more than counting the solutions of the board up to 2.
+      * with the bitmask backend one engine follows the board through the whole pass, a removal or
+        a digit tried only updates its masks instead of loading a new engine for every search.
+      * the result of every check is kept in uniqueness_memo under the Zobrist key of the board,
+        updated in O(1) per removal, so a board checked before (the same seed generated again) is
+        not searched again.
+      * difficulty ("easy", "medium", "hard" or "expert") only removes a clue if the board can still
+        be solved by TechniqueSolver without techniques harder than the difficulty. A logical solve
+        proves the solution is unique, so no search is needed, and a removal that makes the board too
+        hard is rejected at once. Removing clues only makes a board harder, so a clue rejected once is
+        never tried again. removals defaults to difficulty_removals, and the difficulty reached is
+        saved in self.difficulty, it can be easier than asked for when the pass runs out of clues.
+    """
+    @stats_phase("remove_clues")
+    def remove_clues(self, seed=None, removals=None, difficulty=None):
+        if removals == None and difficulty != None:
+            removals = self.difficulty_removals[difficulty] * self.size * self.size // 81
+        elif removals == None:
+            removals = self.default_removals.get(self.box_size, self.size * self.size // 2)
+
         # initialize count
         removed = 0
 
-        # Remove 54 random clues, leaving 27 on the board
-        while removed < 54:
+        # search work done over every uniqueness check
+        self.uniqueness_checks = 0
+        nodes = 0
+        backtracks = 0
+
+        # shuffle the order the cells are tried in
+        generator = random.Random(seed) if seed != None else random
+        cells = [(row, column) for row in range(self.size) for column in range(self.size)]
+        generator.shuffle(cells)
+
+        # key of the board's clues, and an engine kept in step with the board for every search
+        keys = self.uniqueness_memo.keys(self.size)
+        key = self.uniqueness_memo.key(self.player_board)
+        engine = CandidateEngine(self.player_board, self.box_size) \
+            if difficulty == None and self.backend == "bitmask" else None
 
-            # choose a random cell to remove
-            row, column = random.randint(0,8), random.randint(0,8)
+        # Remove clues, 54 on a 9 * 9 board leaving 27
+        for row, column in cells:
+            if removed == removals:
+                break
+
+            # skip cells that are already empty
+            if self.player_board[row][column] == None:
+                continue
 
             # backup removed cell in case it needs to be re-inserted
             saved_clue = self.player_board[row][column]
             self.player_board[row][column] = None
+            removed_key = key ^ keys[row * self.size + column][saved_clue]
+            if engine != None:
+                engine.remove(row, column)
+
+            checked = self.uniqueness_memo.get(removed_key) if difficulty == None else None
 
-            # initialize solutions to 0, and check amount of solutions at current step
-            self.solutions = 0
-            self.find_solutions()
+            # check if the board can still be solved logically at the difficulty
+            if difficulty != None:
+                self.solutions = 1 if self.grade(difficulty) != None else 0
+                self.uniqueness_checks += 1
 
-            # if number of solutions = 1, continue. If not re-insert clue and try again.
+            # a board checked before
+            elif checked != None:
+                self.solutions = 1 if checked else 2
+
+            # check if the board still has a single solution, trying every other legal digit in the cell
+            else:
+                self.solutions = 1
+
+                # digits the emptied cell can legally take, from the masks of the engine following the
+                # board in a single check, else by scanning the board for each digit
+                if engine != None:
+                    free = engine.candidates(row, column)
+                    digits = [num for num in range(1, self.size + 1) if free & (1 << num)]
+                    if self.stats != None:
+                        self.stats.current().legality_checks += 1
+                else:
+                    digits = [num for num in range(1, self.size + 1) if self.is_legal(row, column, num)]
+
+                for num in digits:
+                    if num != saved_clue:
+                        self.player_board[row][column] = num
+
+                        # search the engine following the board, or load the board into a new one
+                        if engine != None:
+                            engine.place(row, column, num)
+                            search = engine
+                        else:
+                            search = self.create_engine()
+
+                        found = search.count_solutions(self.strategy, 1)
+                        if engine != None:
+                            engine.remove(row, column)
+
+                        self.uniqueness_checks += 1
+                        nodes += search.nodes
+                        backtracks += search.backtracks
+                        if self.stats != None:
+                            self.stats.add_search(search)
+
+                        if found:
+                            self.solutions = 2
+                            break
+
+                self.player_board[row][column] = None
+                self.uniqueness_memo.put(removed_key, self.solutions == 1)
+
+            # if number of solutions = 1, continue. If not the clue is required, re-insert it.
             if self.solutions == 1:
+                self.player_board[row][column] = None
+                key = removed_key
                 removed += 1
             else:
                 self.player_board[row][column] = saved_clue
+                if engine != None:
+                    engine.place(row, column, saved_clue)
 
-        return
+        self.nodes = nodes
+        self.backtracks = backtracks
 
-    """solving a given board"""
-    def find_solutions(self):
+        if self.stats != None:
+            self.stats.current().uniqueness_checks += self.uniqueness_checks
 
-        # get the next empty cell to guess
-        row, column = self.next_cell()
+        # grade the finished puzzle
+        if difficulty != None:
+            self.grade()
 
-        # if row or column returned with a true value, the puzzle is complete.
-        if row == None:
-            return True
+        return
 
-        # make a choice in the current cell
-        for choice in range(1,10):
+    """
+    grade the player board with TechniqueSolver, saving and returning its difficulty
+      * max_difficulty stops at techniques harder than it
+      * returns None if the board can't be solved logically, because it needs harder techniques
+        or it has more than one solution
+    """
+    @stats_phase("grade")
+    def grade(self, max_difficulty=None):
+        self.difficulty = TechniqueSolver(self.player_board, self.box_size).grade(max_difficulty)
+
+        return self.difficulty
+
+    """
+    count the solutions of the player board, stopping as soon as limit solutions are found
+      * the search runs on its own copy of the board, so the player board is never changed
+      * limit=None counts every solution
+    """
+    @stats_phase("count_solutions")
+    def count_solutions(self, limit=2):
+        engine = self.create_engine()
+        solutions = engine.count_solutions(self.strategy, limit)
+
+        self.nodes = engine.nodes
+        self.backtracks = engine.backtracks
+        if self.stats != None:
+            self.stats.add_search(engine)
+
+        return solutions
 
-            # check if it is a legal choice
-            if self.is_legal(row, column, choice):
-                self.player_board[row][column] = choice
+    """solving a given board"""
+    @stats_phase("find_solutions")
+    def find_solutions(self):
+        # load the board into the solver backend
+        engine = self.create_engine()
+        self.nodes = 0
+        self.backtracks = 0
 
-                # check if the puzzle was solved
-                if self.find_solutions():
-                    self.solutions += 1
-                    break
+        # if there are no empty cells, the puzzle is complete.
+        if not engine.empty_cells():
+            return True
 
-        # back track to erase the solutions just discovered.
-        self.player_board[row][column] = None
+        # count every solution, the player board is left unchanged
+        self.solutions += engine.count_solutions(self.strategy)
+        self.nodes = engine.nodes
+        self.backtracks = engine.backtracks
+        if self.stats != None:
+            self.stats.add_search(engine)
 
         return
 
-    """save a fresh copy of the playable board"""
+    """
+    yield the solutions of the player board one at a time as read only compact boards
+      * limit stops after that many solutions, None yields every solution, so a caller can stream,
+        count or take the first k solutions of an under-constrained board in constant memory
+      * the search runs on its own copy of the board, so the player board is never changed
+      * nodes and backtracks are set once the generator is exhausted or closed
+    """
+    def iter_solutions(self, limit=None):
+        engine = self.create_engine()
+        solutions = engine.iter_solutions(self.strategy, limit)
+
+        try:
+            for cells in solutions:
+                yield CompactBoard(cells, self.size).freeze()
+        finally:
+            solutions.close()
+            self.nodes = engine.nodes
+            self.backtracks = engine.backtracks
+
+    """solve the player board in place with its first solution, returns True if it has one"""
+    @stats_phase("solve")
+    def solve(self):
+        # load the board into the solver backend
+        engine = self.create_engine()
+        self.nodes = 0
+        self.backtracks = 0
+
+        solved = engine.solve(self.strategy)
+        self.nodes = engine.nodes
+        self.backtracks = engine.backtracks
+        if self.stats != None:
+            self.stats.add_search(engine)
+
+        if solved:
+            engine.write_board(self.player_board)
+
+        return solved
+
+    """
+    load a generated puzzle and its solution as strings of size * size symbols (see CompactBoard.symbols),
+    0 marking an empty cell
+      * the puzzle becomes both the player board and the fresh board
+    """
+    def load_puzzle(self, puzzle, solution):
+        self.player_board = CompactBoard.from_string(puzzle)
+        self.solved_board = CompactBoard.from_string(solution).freeze()
+        self.save_fresh_board()
+
+    """save a read only copy of the playable board"""
     def save_fresh_board(self):
-
-        # create empty rows
-        for i in range(9):
-            self.fresh_board.append([])
-
-            # insert column values into each row
-            for j in range(9):
-                self.fresh_board[i].append(self.player_board[i][j])
+        self.fresh_board = self.player_board.freeze()
 
         return
 
 
     """check if puzzle is solved"""
     def check_if_solved(self):
-        # iterate rows and columns checking solution against player attempt
-        for i in range(9):
-            for j in range(9):
-                if self.solved_board[i][j] != self.player_board[i][j]:
-                    return False
-
-        return True
+        # compare every cell of the solution against the player attempt
+        return self.solved_board == self.player_board
 
     """print sudoku board to console for testing purposes"""
     def print_sudoku(self):
@@ -189,33 +440,34 @@ class SudokuBoard():
         print(f'  - Locked cells in {ConsoleColors.BOLD}WHITE{ConsoleColors.RESET}')
 
         # iterate printed rows
-        for i in range(19):
+        for i in range(2 * self.size + 1):
 
-            # minor row borders
-            if i in [2,4,8,10,14,16]:
-                print('+   ' * 9 + '+')
             # major row borders
-            elif i in [0,6,12,18]:
-                print('+---' * 9 + '+')
+            if i % (2 * self.box_size) == 0:
+                print('+---' * self.size + '+')
+            # minor row borders
+            elif i % 2 == 0:
+                print('+   ' * self.size + '+')
             else:
 
                 # iterate printed columns
-                for j in range(37):
+                for j in range(4 * self.size + 1):
 
                     # column borders
-                    if j in [0,12,24,36]:
+                    if j % (4 * self.box_size) == 0:
                         print('|', end = '')
 
                     # columns for number input
-                    elif j in [2,6,10,14,18,22,26,30,34]:
+                    elif j % 4 == 2:
+                        symbol = CompactBoard.symbols[self.solved_board[int(i/2)][int(j/4)] or 0]
 
                         # if the user must input the number, color it red
                         if self.fresh_board[int(i/2)][int(j/4)] == None:
-                            print(f'{ConsoleColors.RED}{self.solved_board[int(i/2)][int(j/4)]}{ConsoleColors.RESET}', end = '')
+                            print(f'{ConsoleColors.RED}{symbol}{ConsoleColors.RESET}', end = '')
 
                         # if the cell is locked, color it white
                         else:
-                            print(f'{self.solved_board[int(i/2)][int(j/4)]}', end = '')
+                            print(f'{symbol}', end = '')
 
                     # digit buffer
                     else:
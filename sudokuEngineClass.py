@@ -0,0 +1,288 @@
+
+# import sudoku board class
+from sudokuBoardClass import SudokuBoard
+
+# import hint engine for the next logical step
+from hintEngineClass import HintEngine
+
+"""
+Headless game session: owns the board state and every game rule, without importing pygame.
+  * PygameGUI is a view over this class, servers and workers can use it directly.
+  * Cells are (row, column) tuples, kept in sets so membership tests are O(1).
+  * Rule conflicts are tracked incrementally: each row, column and sub-grid keeps a count of every
+    digit, and an edit only re-evaluates the cells sharing a unit with the edited cell.
+  * Hints come from a HintEngine following every edit, so asking for a hint again is O(1).
+  * The board is box_size * box_size cells wide, 9 * 9 by default.
+  * difficulty ("easy", "medium", "hard" or "expert") generates puzzles of that difficulty, any by default.
+"""
+class SudokuEngine():
+    # cells sharing a row, column or sub-grid with each cell, cached per box size
+    peer_tables = {}
+
+    """start a new game of box_size * box_size sub-grids, taking boards from puzzle_bank when one is given"""
+    def __init__(self, puzzle_bank=None, box_size=3, difficulty=None):
+        self.puzzle_bank = puzzle_bank
+        self.box_size = box_size
+        self.difficulty = difficulty
+        self.size = box_size * box_size
+        self.peers = self.__peers(box_size)
+
+        # initialize game state
+        self.board = None
+        self.cells_locked = set()
+        self.complete = False
+        self.incorrect_cells = set()
+        self.correct_cells = set()
+        self.solved_cells = set()
+        self.hint_cell = None
+        self.hints = None
+
+        # how many times each digit is on the board in every row, column and sub-grid, and filled cells
+        self.row_counts = []
+        self.column_counts = []
+        self.box_counts = []
+        self.filled = 0
+
+        self.new()
+
+    """
+    Functions to change the board
+    """
+
+    """
+    set a cell to digit 1 to size, returns False if the cell is locked or the digit is invalid
+      * only the cells sharing a row, column or sub-grid with the cell are re-checked
+    """
+    def set_cell(self, row, column, num):
+        if (row, column) in self.cells_locked or num not in range(1, self.size + 1):
+            return False
+
+        # set player board cell value to input and check if the cell is correct or not
+        self.write_cell(row, column, num)
+
+        self.remove_solved_cell((row, column))
+
+        # check if board complete is now true
+        self.board_complete()
+
+        # remove the hint when a change is made
+        self.hint_cell = None
+
+        return True
+
+    """clear a cell, returns False if the cell is locked"""
+    def clear_cell(self, row, column):
+        if (row, column) in self.cells_locked:
+            return False
+
+        # set player board cell value to None, removing it from the incorrect cells
+        self.complete = False
+        self.write_cell(row, column, None)
+
+        self.remove_solved_cell((row, column))
+
+        # remove the hint when a change is made
+        self.hint_cell = None
+
+        return True
+
+    """
+    choose the hint cell, a cell holding a wrong digit or else the easiest next logical deduction
+      * returns the cell, its answer and the technique deducing it (see HintEngine), None once solved
+    """
+    def hint(self):
+        hint = self.hints.hint()
+        if hint == None:
+            return None
+
+        self.hint_cell = hint[0]
+        return hint
+
+    """solve any blank or incorrect cells from the solved board"""
+    def solve(self):
+        # remove the hint
+        self.hint_cell = None
+
+        # iterate array
+        for i in range(self.size):
+            for j in range(self.size):
+
+                #skip locked cells, correct cells, solved cells
+                if (i, j) not in self.cells_locked \
+                        and (i, j) not in self.solved_cells\
+                        and self.board.player_board[i][j] != self.board.solved_board[i][j]:
+
+                    # input correct values, updating the incorrect and correct cells
+                    self.write_cell(i, j, self.board.solved_board[i][j])
+
+                    # add cell to solved cells
+                    self.solved_cells.add((i, j))
+
+        # check that board is complete
+        self.board_complete()
+
+    """if cell is deleted or changed remove cell from solved"""
+    def remove_solved_cell(self, cell):
+        self.solved_cells.discard(cell)
+
+    """erase all user input"""
+    def reset(self):
+        # re-initialize playing states
+        self.complete = False
+        self.solved_cells = set()
+        self.hint_cell = None
+
+        # iterate unlocked cells and set them to None
+        for i in range(self.size):
+           for j in range(self.size):
+               if (i, j) not in self.cells_locked:
+                   self.board.player_board[i][j] = None
+
+        # recount the digits left on the board
+        self.count_digits()
+        self.hints.load(self.board.player_board)
+
+    """start a new game with a unique and valid board with a single solution"""
+    def new(self):
+        # initialize new game
+        self.cells_locked = set()
+        self.complete = False
+        self.solved_cells = set()
+        self.hint_cell = None
+
+        # take a ready board from the puzzle bank
+        self.board = self.puzzle_bank.pop() if self.puzzle_bank != None else None
+
+        # generate new board if there is no bank or it is empty
+        if self.board == None:
+            self.board = SudokuBoard(box_size=self.box_size)
+            self.board.generate(difficulty=self.difficulty)
+
+        # initialize locked cells and digit counts
+        self.flag_locked_cells()
+        self.count_digits()
+        self.hints = HintEngine(self.board.player_board, self.board.solved_board, self.box_size)
+
+    """add locked cells to locked cells array"""
+    def flag_locked_cells(self):
+        # iterate original board
+        for i in range(self.size):
+            for j in range(self.size):
+                number = self.board.fresh_board[i][j]
+
+                # lock cells containing provided hints
+                if number != None:
+                    self.cells_locked.add((i, j))
+
+
+    """index of the sub-grid holding a cell, sub-grids numbered row by row"""
+    def box_index(self, row, column):
+        return (row // self.box_size) * self.box_size + column // self.box_size
+
+    """cells sharing a row, column or sub-grid with each cell of a box_size board, built once per size"""
+    @classmethod
+    def __peers(cls, box_size):
+        if box_size not in cls.peer_tables:
+            size = box_size * box_size
+            cls.peer_tables[box_size] = {
+                (row, column): [(r, c) for r in range(size) for c in range(size)
+                                if (r, c) != (row, column)
+                                and (r == row or c == column
+                                     or (r // box_size == row // box_size and c // box_size == column // box_size))]
+                for row in range(size) for column in range(size)}
+
+        return cls.peer_tables[box_size]
+
+
+    """
+     Functions to verify user solutions
+    """
+
+    """check if the board is complete, from the count of filled cells"""
+    def board_complete(self):
+        self.complete = self.filled == self.size * self.size
+        return self.complete
+
+    """the game is won when the board is complete and no cell breaks the sudoku rule set"""
+    def is_won(self):
+        return not self.incorrect_cells and self.complete == True
+
+    """
+    highlight all user input cells breaking sudoku rule set
+      * conflicts are kept up to date by every edit, so this only reports the incorrect cells
+    """
+    def check(self):
+        return self.incorrect_cells
+
+    """count every digit on the board per unit and re-evaluate every cell"""
+    def count_digits(self):
+        self.row_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.column_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.box_counts = [[0] * (self.size + 1) for _ in range(self.size)]
+        self.incorrect_cells = set()
+        self.correct_cells = set()
+        self.filled = 0
+
+        for row in range(self.size):
+            for column in range(self.size):
+                num = self.board.player_board[row][column]
+                if num != None:
+                    self.filled += 1
+                    self.row_counts[row][num] += 1
+                    self.column_counts[column][num] += 1
+                    self.box_counts[self.box_index(row, column)][num] += 1
+
+        for row in range(self.size):
+            for column in range(self.size):
+                self.check_cell(row, column)
+
+    """write a digit or None to the player board, updating the counts and the cells it can affect"""
+    def write_cell(self, row, column, num):
+        box = self.box_index(row, column)
+        old = self.board.player_board[row][column]
+
+        # move the counts from the old digit to the new one
+        if old != None:
+            self.filled -= 1
+            self.row_counts[row][old] -= 1
+            self.column_counts[column][old] -= 1
+            self.box_counts[box][old] -= 1
+        if num != None:
+            self.filled += 1
+            self.row_counts[row][num] += 1
+            self.column_counts[column][num] += 1
+            self.box_counts[box][num] += 1
+
+        self.board.player_board[row][column] = num
+        self.hints.edit(row, column, num)
+
+        # only peers holding the old or new digit can change state
+        self.check_cell(row, column)
+        for r, c in self.peers[(row, column)]:
+            peer = self.board.player_board[r][c]
+            if peer != None and (peer == old or peer == num):
+                self.check_cell(r, c)
+
+    """determines if a cell breaks the rule set from the digit counts of its row, column and sub-grid"""
+    def check_cell(self, row, column):
+        # don't evaluate or change locked cells
+        if (row, column) in self.cells_locked:
+            return
+
+        num = self.board.player_board[row][column]
+
+        # If cell is None, remove from incorrect and correct cells.
+        if num == None:
+            self.incorrect_cells.discard((row, column))
+            self.correct_cells.discard((row, column))
+
+        # the digit is repeated in its row, column or sub-grid
+        elif self.row_counts[row][num] > 1 or self.column_counts[column][num] > 1 \
+                or self.box_counts[self.box_index(row, column)][num] > 1:
+            self.incorrect_cells.add((row, column))
+            self.correct_cells.discard((row, column))
+
+        # if input is correct
+        else:
+            self.incorrect_cells.discard((row, column))
+            self.correct_cells.add((row, column))
@@ -0,0 +1,519 @@
+# import sudoku board class to solve boards and the generator for the puzzles it serves
+from sudokuBoardClass import SudokuBoard
+from compactBoardClass import CompactBoard
+from batchGenerator import generate_batch
+
+# import logical solver for the difficulty names and the hint engine for next steps
+from techniqueSolverClass import TechniqueSolver
+from hintEngineClass import HintEngine
+
+# import libraries for the event loop, the worker pools, the HTTP responses, logging and command line interface
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+from http import HTTPStatus
+import argparse, asyncio, json, logging, os, random
+
+"""
+Asyncio SUDOKU service answering JSON requests over local HTTP or a Unix socket.
+  * POST /generate, /solve, /validate and /hint with a JSON object body, every response is a JSON object.
+  * Searches and validation run in a pool of worker processes, the event loop only parses requests
+    and writes responses, so it never blocks on a board.
+  * Requests to the same endpoint arriving within batch_delay seconds of each other are sent to a
+    worker together, up to batch_size at a time, so one round trip to the pool serves many requests.
+  * Backpressure: once max_pending requests are waiting on the pool, new ones are answered at once
+    with 503 and a Retry-After header instead of queueing without bound.
+  * /hint answers are kept per (puzzle, board), so the hottest repeated hints never reach a worker.
+  * /generate without a seed takes a puzzle from a stock generated ahead in the background, one
+    stock per box size and difficulty, so bursts don't wait on generation while the stock lasts.
+  * Connections are kept alive between requests (HTTP/1.1), one request at a time per connection.
+  * workers=0 runs the work in a single thread of this process, a stand-in for local testing, and
+    handle() answers a request without a socket at all.
+
+Endpoints, boards are strings of size * size symbols with 0 or . for an empty cell:
+    /generate  {"box_size": 3, "difficulty": null, "seed": null} -> {"puzzle", "solution"}
+    /solve     {"puzzle"}                                         -> {"solution" or null, "unique"}
+    /validate  {"board"}                                          -> {"valid", "complete", "solved", "conflicts"}
+    /hint      {"puzzle", "board"}                                -> {"cell": [row, column] or null, "digit", "technique"}
+
+Usage:
+    python sudokuServiceClass.py --port 8080 --workers 8
+    python sudokuServiceClass.py --unix /tmp/sudoku.sock
+"""
+
+
+# errors of the background work no request is waiting on
+logger = logging.getLogger(__name__)
+
+# most puzzles each worker keeps a hint engine for, and the engines by puzzle string
+_HINT_ENGINES = 256
+_hint_engines = OrderedDict()
+
+
+"""board string of a request field, raises a ValueError if it isn't one"""
+def _board_string(payload, key):
+    board = payload.get(key)
+    if not isinstance(board, str) or len(board) not in (16, 81, 256, 625) \
+            or not set(board.upper()) <= set(CompactBoard.symbols[:_box_size(board) ** 2 + 1] + "."):
+        raise ValueError(f'"{key}" must be a board string of 16, 81, 256 or 625 symbols')
+
+    return board
+
+
+"""box size of a board string"""
+def _box_size(board):
+    return int(round(len(board) ** 0.25))
+
+
+"""
+run a request function on each payload of a batch
+  * returns a (status, response) pair per payload, a ValueError answers its request with 400 and
+    any other error with 500, so a bad request only fails itself and not the rest of its batch
+"""
+def _answer_each(function, payloads, *arguments):
+    results = []
+    for payload in payloads:
+        try:
+            results.append((200, function(payload, *arguments)))
+        except ValueError as error:
+            results.append((400, {"error": str(error)}))
+        except Exception as error:
+            results.append((500, {"error": f'{type(error).__name__}: {error}'}))
+
+    return results
+
+
+"""generate a puzzle from a seed, or from a random seed"""
+def _generate(payload, strategy, backend):
+    box_size = payload.get("box_size", 3)
+    difficulty = payload.get("difficulty")
+    seed = payload.get("seed")
+
+    # JSON true and 3.0 compare equal to 1 and 3, only ints are box sizes
+    if type(box_size) is not int or box_size not in (2, 3, 4, 5):
+        raise ValueError('"box_size" must be 2, 3, 4 or 5')
+    if difficulty != None and difficulty not in TechniqueSolver.difficulties:
+        raise ValueError(f'"difficulty" must be one of {", ".join(TechniqueSolver.difficulties)}')
+
+    # generating a difficulty the board size never reaches would never end
+    if difficulty != None and difficulty not in TechniqueSolver.difficulties_for(box_size):
+        raise ValueError(f'"difficulty" must be one of {", ".join(TechniqueSolver.difficulties_for(box_size))} '
+                         f'for box size {box_size}')
+    if seed != None and type(seed) is not int:
+        raise ValueError('"seed" must be an integer')
+
+    if seed == None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+
+    puzzle, solution = generate_batch([seed], strategy, backend, box_size, difficulty)[0]
+    return {"puzzle": puzzle, "solution": solution}
+
+
+"""
+first solution of a board and whether it is the only one, None if it has none
+  * raises a ValueError for a digit repeated in a row, column or sub-grid, without searching
+"""
+def _solution(puzzle, strategy, backend):
+    board = SudokuBoard(strategy, backend, _box_size(puzzle))
+    board.player_board = CompactBoard.from_string(puzzle)
+    if board.create_engine().conflict:
+        raise ValueError('"puzzle" repeats a digit in a row, column or sub-grid')
+
+    # a second solution is enough to know the first isn't unique
+    solutions = list(board.iter_solutions(limit=2))
+    if not solutions:
+        return None, False
+
+    return solutions[0].to_string(), len(solutions) == 1
+
+
+"""solve a puzzle"""
+def _solve(payload, strategy, backend):
+    solution, unique = _solution(_board_string(payload, "puzzle"), strategy, backend)
+    return {"solution": solution, "unique": unique}
+
+
+"""
+easiest next step for a player board of a puzzle, see HintEngine
+  * board defaults to the puzzle itself
+  * each worker keeps the hint engines of its most recent puzzles, so a puzzle is only solved once
+    and a board already hinted is answered from its cache
+"""
+def _hint(payload, strategy, backend):
+    puzzle = _board_string(payload, "puzzle")
+    board = _board_string(payload, "board") if "board" in payload else puzzle
+    if len(board) != len(puzzle):
+        raise ValueError('"board" and "puzzle" must be the same size')
+
+    engine = _hint_engines.pop(puzzle, None)
+    if engine == None:
+        solution, unique = _solution(puzzle, strategy, backend)
+        if solution == None or not unique:
+            raise ValueError('"puzzle" must have a single solution')
+
+        engine = HintEngine(CompactBoard.from_string(puzzle), CompactBoard.from_string(solution), _box_size(puzzle))
+
+    # most recently used last
+    _hint_engines[puzzle] = engine
+    if len(_hint_engines) > _HINT_ENGINES:
+        _hint_engines.popitem(last=False)
+
+    engine.load(CompactBoard.from_string(board))
+    hint = engine.hint()
+    if hint == None:
+        return {"cell": None, "digit": None, "technique": None}
+
+    return {"cell": list(hint[0]), "digit": hint[1], "technique": hint[2]}
+
+
+"""generate a batch of puzzles in a worker"""
+def generate_requests(payloads, strategy="mrv", backend="bitmask"):
+    return _answer_each(_generate, payloads, strategy, backend)
+
+
+"""solve a batch of puzzles in a worker"""
+def solve_requests(payloads, strategy="mrv", backend="bitmask"):
+    return _answer_each(_solve, payloads, strategy, backend)
+
+
+"""hint a batch of boards in a worker"""
+def hint_requests(payloads, strategy="mrv", backend="bitmask"):
+    return _answer_each(_hint, payloads, strategy, backend)
+
+
+"""
+validate a batch of boards in a worker, every board of a size in one vectorized call
+  * requires numpy, imported here so the rest of the service runs without it
+"""
+def validate_requests(payloads, strategy="mrv", backend="bitmask"):
+    from batchValidator import boards_from_strings, validate_boards
+
+    results = _answer_each(lambda payload: _board_string(payload, "board"), payloads)
+
+    # group the well formed boards by size
+    sizes = {}
+    for k, (status, board) in enumerate(results):
+        if status == 200:
+            sizes.setdefault(len(board), []).append(k)
+
+    for batch in sizes.values():
+        valid, complete, conflicts = validate_boards(boards_from_strings([results[k][1] for k in batch]))
+        for n, k in enumerate(batch):
+            results[k] = (200, {"valid": bool(valid[n]), "complete": bool(complete[n]),
+                                "solved": bool(valid[n] and complete[n]),
+                                "conflicts": [[int(i), int(j)] for i, j in zip(*conflicts[n].nonzero())]})
+
+    return results
+
+
+"""
+Asyncio server answering SUDOKU requests from a pool of workers, see the module docstring.
+"""
+class SudokuService():
+    # function answering a batch of requests to each endpoint
+    routes = {"/generate": generate_requests, "/solve": solve_requests,
+              "/validate": validate_requests, "/hint": hint_requests}
+
+    # largest request body accepted
+    max_body = 1 << 16
+
+    # most (puzzle, board) hints kept to answer without a worker
+    hint_cache_size = 1 << 16
+
+    """
+    set up a service, the pool and socket are created by start()
+      * workers is the number of worker processes, None uses every core, 0 works in one thread of this process
+      * batch_size is the most requests sent to a worker at a time, batch_delay the seconds a request
+        waits for others to join its batch
+      * max_pending is the most requests waiting on the workers before new ones are refused with 503
+      * stock is the number of puzzles generated ahead for each box size and difficulty, 0 for none
+      * strategy and backend select the solver, see SudokuBoard
+    """
+    def __init__(self, workers=None, batch_size=32, batch_delay=0.002, max_pending=4096, stock=64,
+                 strategy="mrv", backend="bitmask"):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_pending = max_pending
+        self.stock = stock
+        self.strategy = strategy
+        self.backend = backend
+
+        self.pool = None
+        self.server = None
+        self.pending = 0
+
+        # requests waiting to be batched and the timer sending each endpoint's batch
+        self.queues = {}
+        self.timers = {}
+
+        # generated puzzles for each (box size, difficulty) and the ones being refilled
+        self.stocks = {}
+
+        # hint answered for each (puzzle, board), least recently used first
+        self.hint_cache = OrderedDict()
+
+        # task refilling each stock being refilled, kept until it is done so it isn't garbage collected
+        self.refilling = {}
+
+        # task reading each open connection, closed with the service
+        self.connections = {}
+
+    """start the worker pool and listen on a Unix socket at path, or else on host and port"""
+    async def start(self, host="127.0.0.1", port=8080, path=None):
+        if self.workers == 0:
+            self.pool = ThreadPoolExecutor(max_workers=1)
+        else:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers or os.cpu_count() or 1)
+
+        if path != None:
+            self.server = await asyncio.start_unix_server(self.__connection, path)
+        else:
+            self.server = await asyncio.start_server(self.__connection, host, port)
+
+        return self.server
+
+    """start and serve until cancelled"""
+    async def serve(self, host="127.0.0.1", port=8080, path=None):
+        await self.start(host, port, path)
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    """stop listening and shut the worker pool down"""
+    async def close(self):
+        if self.server != None:
+            self.server.close()
+            for writer in self.connections:
+                writer.close()
+            await asyncio.gather(*self.connections.values(), return_exceptions=True)
+            await self.server.wait_closed()
+            self.server = None
+
+        if self.pool != None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exception):
+        await self.close()
+
+    """
+    answer one request to an endpoint
+      * returns (status, response), response being a JSON serializable dict
+    """
+    async def handle(self, route, payload):
+        if route not in self.routes:
+            return 404, {"error": f'unknown endpoint "{route}"'}
+        if not isinstance(payload, dict):
+            return 400, {"error": "the request body must be a JSON object"}
+
+        # a puzzle generated ahead answers at once
+        if route == "/generate" and payload.get("seed") == None and self.stock:
+            puzzle = self.__take_stock(payload.get("box_size", 3), payload.get("difficulty"))
+            if puzzle != None:
+                return 200, {"puzzle": puzzle[0], "solution": puzzle[1]}
+
+        # a board hinted before answers at once
+        key = None
+        if route == "/hint" and isinstance(payload.get("puzzle"), str) and isinstance(payload.get("board", ""), str):
+            key = (payload["puzzle"], payload.get("board"))
+            if key in self.hint_cache:
+                self.hint_cache.move_to_end(key)
+                return 200, self.hint_cache[key]
+
+        if self.pending >= self.max_pending:
+            return 503, {"error": "the service is busy, retry later"}
+
+        self.pending += 1
+        try:
+            status, response = await self.__submit(route, payload)
+        except Exception as error:
+            return 500, {"error": f'{type(error).__name__}: {error}'}
+        finally:
+            self.pending -= 1
+
+        if key != None and status == 200:
+            self.hint_cache[key] = response
+            if len(self.hint_cache) > self.hint_cache_size:
+                self.hint_cache.popitem(last=False)
+
+        return status, response
+
+    """queue a request for its endpoint's next batch and wait for its answer"""
+    def __submit(self, route, payload):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        queue = self.queues.setdefault(route, [])
+        queue.append((payload, future))
+
+        # send a full batch at once, else wait a moment for others to join it
+        if len(queue) >= self.batch_size:
+            self.__flush(route)
+        elif len(queue) == 1:
+            self.timers[route] = loop.call_later(self.batch_delay, self.__flush, route)
+
+        return future
+
+    """send an endpoint's queued requests to a worker"""
+    def __flush(self, route):
+        timer = self.timers.pop(route, None)
+        if timer != None:
+            timer.cancel()
+
+        batch = self.queues.pop(route, [])
+        if not batch:
+            return
+
+        work = asyncio.get_running_loop().run_in_executor(
+            self.pool, self.routes[route], [payload for payload, _ in batch], self.strategy, self.backend)
+        work.add_done_callback(lambda done: self.__deliver(batch, done))
+
+    """hand each request of a finished batch its answer, or the batch's error"""
+    def __deliver(self, batch, done):
+        if done.cancelled():
+            error = asyncio.CancelledError()
+        else:
+            error = done.exception()
+
+        for k, (_, future) in enumerate(batch):
+            # the client may have gone away
+            if future.done():
+                continue
+            if error != None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[k])
+
+    """pop a puzzle generated ahead, refilling the stock in the background, None if it is empty"""
+    def __take_stock(self, box_size, difficulty):
+        key = (box_size, difficulty)
+        if type(box_size) is not int or box_size not in (2, 3, 4, 5) \
+                or (difficulty != None and difficulty not in TechniqueSolver.difficulties_for(box_size)):
+            return None
+
+        puzzles = self.stocks.setdefault(key, [])
+        puzzle = puzzles.pop() if puzzles else None
+
+        # top the stock up once it is below half
+        if len(puzzles) * 2 < self.stock and key not in self.refilling:
+            self.refilling[key] = asyncio.ensure_future(self.__refill(key))
+
+        return puzzle
+
+    """generate puzzles for a stock, a batch at a time, until it is full"""
+    async def __refill(self, key):
+        box_size, difficulty = key
+        loop = asyncio.get_running_loop()
+        try:
+            while len(self.stocks[key]) < self.stock and self.pool != None:
+                seed = random.SystemRandom().randrange(2 ** 32)
+                seeds = range(seed, seed + min(self.batch_size, self.stock - len(self.stocks[key])))
+                self.stocks[key].extend(await loop.run_in_executor(
+                    self.pool, generate_batch, seeds, self.strategy, self.backend, box_size, difficulty))
+        except (RuntimeError, BrokenProcessPool, asyncio.CancelledError):
+            # the pool is shutting down or lost a worker, the stock refills on a later request
+            pass
+        except Exception:
+            logger.exception("refilling the %s stock failed", key)
+        finally:
+            self.refilling.pop(key, None)
+
+    """read HTTP/1.1 requests from a connection and answer each one"""
+    async def __connection(self, reader, writer):
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+
+                # request line and headers
+                try:
+                    method, target, version = request.decode("latin-1").split()
+                except ValueError:
+                    await self.__respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > self.max_body:
+                    await self.__respond(writer, 413, {"error": "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                if method != "POST":
+                    status, response = 405, {"error": "use POST"}
+                else:
+                    try:
+                        payload = json.loads(body) if body else {}
+                    except ValueError:
+                        status, response = 400, {"error": "the request body must be JSON"}
+                    else:
+                        status, response = await self.handle(target.split("?")[0], payload)
+
+                await self.__respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+    """write a JSON response"""
+    async def __respond(self, writer, status, response, keep_alive):
+        body = json.dumps(response).encode("utf-8")
+        head = f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n' \
+               f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        if not keep_alive:
+            head += "Connection: close\r\n"
+
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+
+"""command line interface, serves until interrupted"""
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Serve SUDOKU generation, solving, validation and hints.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--unix", default=None, help="listen on a Unix socket at this path instead")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, defaults to every core, 0 works in one thread for testing")
+    parser.add_argument("--batch-size", type=int, default=32, help="most requests sent to a worker at a time")
+    parser.add_argument("--batch-delay", type=float, default=2.0,
+                        help="milliseconds a request waits for others to join its batch")
+    parser.add_argument("--max-pending", type=int, default=4096,
+                        help="requests waiting on the workers before new ones are refused")
+    parser.add_argument("--stock", type=int, default=64,
+                        help="puzzles generated ahead for each box size and difficulty")
+    parser.add_argument("--strategy", default="mrv", choices=["ordered", "mrv"], help="search strategy")
+    parser.add_argument("--backend", default="bitmask", choices=["bitmask", "dlx"], help="solver backend")
+    arguments = parser.parse_args(arguments)
+
+    service = SudokuService(arguments.workers, arguments.batch_size, arguments.batch_delay / 1000,
+                            arguments.max_pending, arguments.stock, arguments.strategy, arguments.backend)
+    try:
+        asyncio.run(service.serve(arguments.host, arguments.port, arguments.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+# import combinations to pick the cells and digits of naked and hidden subsets
+from itertools import combinations
+
+# import deque to search xy-chains breadth first, shortest chain first
+from collections import deque
+
+"""
+Logical SUDOKU solver that grades a puzzle by the hardest technique needed to solve it.
+  * Solves like a person: it never guesses, each step applies the easiest technique that makes progress.
+  * Each empty cell keeps a bitmask of its candidates, bit d set for digit d, and placing a digit
+    removes it from the candidates of every peer.
+  * Every technique is a deduction valid for any solution of the board, so a board solved by this
+    solver has exactly one solution. A board with several solutions is never solved.
+  * Techniques, easiest first, and the difficulty a puzzle needing them is graded as:
+      easy   - naked single, hidden single
+      medium - locked candidates (pointing and claiming), naked pair, hidden pair
+      hard   - naked triple, hidden triple, x-wing, xy-wing (an xy-chain of 3 cells)
+      expert - longer xy-chains
+"""
+class TechniqueSolver():
+    # difficulties from easiest to hardest
+    difficulties = ("easy", "medium", "hard", "expert")
+
+    # hardest difficulty of the puzzles of a box size, singles solve every 4 * 4 puzzle with one solution
+    max_difficulties = {2: "easy"}
+
+    # look up tables shared by every solver of the same board size
+    layouts = {}
+
+    """load the digits of a board (ints or None), box_size 3 is a 9 * 9 board"""
+    def __init__(self, board, box_size=3):
+        self.size = box_size * box_size
+        self.box_size = box_size
+        self.full_mask = ((1 << self.size) - 1) << 1
+
+        # look up tables from a flat cell index to its units and peers, and the cells of every unit
+        self.units_of, self.peers, self.units = self.__layout(self.size, box_size)
+
+        # flat copy of the board, 0 marks an empty cell, and the candidates of every cell
+        self.cells = [0] * (self.size * self.size)
+        self.candidates = [self.full_mask] * (self.size * self.size)
+
+        # technique steps applied, the hardest technique and difficulty needed by the last grade
+        self.steps = {}
+        self.hardest = None
+        self.difficulty = None
+
+        # a given digit clashing with another one, or a cell left without candidates
+        self.contradiction = False
+
+        for i in range(self.size):
+            for j in range(self.size):
+                if board[i][j] != None:
+                    index = i * self.size + j
+                    if not self.candidates[index] & (1 << board[i][j]):
+                        self.contradiction = True
+                    self.__assign(index, board[i][j])
+
+    """difficulties a puzzle of a box size can be graded, easiest first"""
+    @classmethod
+    def difficulties_for(cls, box_size):
+        hardest = cls.max_difficulties.get(box_size, cls.difficulties[-1])
+        return cls.difficulties[:cls.difficulties.index(hardest) + 1]
+
+    """build the look up tables for a board size once and share them between solvers"""
+    @classmethod
+    def __layout(cls, size, box_size):
+        if size not in cls.layouts:
+            cells = range(size * size)
+
+            # row, column and sub-grid unit numbers of each cell, columns after rows and sub-grids after columns
+            units_of = [(index // size, size + index % size,
+                         2 * size + (index // size // box_size) * box_size + index % size // box_size)
+                        for index in cells]
+            units = [[index for index in cells if i in units_of[index]] for i in range(3 * size)]
+            peers = [sorted(set(units[row] + units[column] + units[box]) - {index})
+                     for index, (row, column, box) in enumerate(units_of)]
+
+            cls.layouts[size] = (units_of, peers, units)
+
+        return cls.layouts[size]
+
+    """
+    solve the board with techniques up to max_difficulty, every technique by default
+      * returns the difficulty of the hardest technique used, or None if the board can't be solved
+        without harder techniques or guessing
+      * steps counts how often each technique made progress, hardest is the name of the hardest one
+    """
+    def grade(self, max_difficulty=None):
+        techniques = self.__techniques(max_difficulty)
+
+        self.steps = {}
+        self.hardest = None
+        self.difficulty = None
+        hardest = -1
+
+        while not self.contradiction and 0 in self.cells:
+            # apply the easiest technique that makes progress, then start again from the easiest
+            for position, (name, difficulty, technique) in enumerate(techniques):
+                if technique():
+                    self.steps[name] = self.steps.get(name, 0) + 1
+                    if position > hardest:
+                        hardest = position
+                        self.hardest = name
+                    break
+
+            # stuck, the board needs a harder technique
+            else:
+                return None
+
+        if self.contradiction:
+            return None
+
+        self.difficulty = techniques[hardest][1] if hardest >= 0 else self.difficulties[0]
+
+        return self.difficulty
+
+    """
+    easiest next digit to place, without placing it
+      * eliminations are applied, easiest first, until a naked or hidden single appears
+      * returns (index, digit, technique), technique being the hardest one needed to reach the single,
+        or None if the board can't progress without harder techniques or guessing
+    """
+    def next_placement(self, max_difficulty=None):
+        eliminations = self.__techniques(max_difficulty)[2:]
+        hardest = -1
+        name = None
+
+        while not self.contradiction:
+            single = self.__find_single()
+            if single != None:
+                return single[0], single[1], name or single[2]
+
+            for position, (technique_name, difficulty, technique) in enumerate(eliminations):
+                if technique():
+                    if position > hardest:
+                        hardest = position
+                        name = technique_name
+                    break
+
+            # stuck, the board needs a harder technique
+            else:
+                return None
+
+        return None
+
+    """every technique up to max_difficulty, easiest first, as (name, difficulty, function)"""
+    def __techniques(self, max_difficulty=None):
+        techniques = [("naked single", "easy", self.__naked_singles),
+                      ("hidden single", "easy", self.__hidden_singles),
+                      ("locked candidates", "medium", self.__locked_candidates),
+                      ("naked pair", "medium", lambda: self.__naked_subsets(2)),
+                      ("hidden pair", "medium", lambda: self.__hidden_subsets(2)),
+                      ("naked triple", "hard", lambda: self.__naked_subsets(3)),
+                      ("hidden triple", "hard", lambda: self.__hidden_subsets(3)),
+                      ("x-wing", "hard", self.__x_wing),
+                      ("xy-wing", "hard", lambda: self.__xy_chain(3)),
+                      ("xy-chain", "expert", lambda: self.__xy_chain(self.size * self.size))]
+
+        # stop at the techniques harder than max_difficulty
+        if max_difficulty != None:
+            limit = self.difficulties.index(max_difficulty)
+            techniques = [technique for technique in techniques if self.difficulties.index(technique[1]) <= limit]
+
+        return techniques
+
+    """first naked single, else first hidden single, as (index, digit, technique), None if there is neither"""
+    def __find_single(self):
+        for index in range(self.size * self.size):
+            free = self.candidates[index]
+            if free and not free & (free - 1):
+                return index, free.bit_length() - 1, "naked single"
+
+        for unit in self.units:
+            once = 0
+            more = 0
+            for index in unit:
+                free = self.candidates[index]
+                more |= once & free
+                once |= free
+
+            hidden = once & ~more
+            if hidden:
+                bit = hidden & -hidden
+                for index in unit:
+                    if self.candidates[index] & bit:
+                        return index, bit.bit_length() - 1, "hidden single"
+
+        return None
+
+    """copy the solver's digits back into a board"""
+    def write_board(self, board):
+        for i in range(self.size):
+            for j in range(self.size):
+                board[i][j] = self.cells[i * self.size + j] or None
+
+    """place a digit and remove it from the candidates of every peer"""
+    def __assign(self, index, num):
+        bit = 1 << num
+        self.cells[index] = num
+        self.candidates[index] = 0
+
+        for peer in self.peers[index]:
+            if self.candidates[peer] & bit:
+                self.candidates[peer] &= ~bit
+
+                # the last candidate of a peer was removed
+                if not self.candidates[peer]:
+                    self.contradiction = True
+
+    """remove candidate digits from cells, returns True if any candidate was removed"""
+    def __eliminate(self, cells, mask):
+        removed = False
+        for index in cells:
+            if self.candidates[index] & mask:
+                self.candidates[index] &= ~mask
+                removed = True
+
+                if not self.candidates[index]:
+                    self.contradiction = True
+
+        return removed
+
+    """digits of a bitmask, smallest first"""
+    def __digits(self, mask):
+        return [num for num in range(1, self.size + 1) if mask & (1 << num)]
+
+    """naked singles: fill every empty cell with a single candidate"""
+    def __naked_singles(self):
+        progress = False
+        for index in range(self.size * self.size):
+            free = self.candidates[index]
+            if free and not free & (free - 1):
+                self.__assign(index, free.bit_length() - 1)
+                progress = True
+
+        return progress
+
+    """hidden singles: fill every digit with a single possible cell in a row, column or sub-grid"""
+    def __hidden_singles(self):
+        progress = False
+        for unit in self.units:
+            once = 0
+            more = 0
+            for index in unit:
+                free = self.candidates[index]
+                more |= once & free
+                once |= free
+
+            hidden = once & ~more
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+
+                # the digit may have been placed by an earlier single in this pass
+                for index in unit:
+                    if self.candidates[index] & bit:
+                        self.__assign(index, bit.bit_length() - 1)
+                        progress = True
+                        break
+
+        return progress
+
+    """
+    locked candidates: a digit whose cells in one unit all lie in a second unit can't be anywhere
+    else in the second unit (pointing from a sub-grid, claiming from a row or column)
+    """
+    def __locked_candidates(self):
+        for number, unit in enumerate(self.units):
+            once = 0
+            for index in unit:
+                once |= self.candidates[index]
+
+            for num in self.__digits(once):
+                bit = 1 << num
+                cells = [index for index in unit if self.candidates[index] & bit]
+                if len(cells) < 2:
+                    continue
+
+                # a second unit holding every cell of the digit
+                for kind in range(3):
+                    other = self.units_of[cells[0]][kind]
+                    if other != number and all(self.units_of[index][kind] == other for index in cells):
+                        if self.__eliminate([index for index in self.units[other] if index not in cells], bit):
+                            return True
+
+        return False
+
+    """naked subsets: n cells of a unit with n candidates between them hold those digits"""
+    def __naked_subsets(self, n):
+        for unit in self.units:
+            cells = [index for index in unit if 2 <= bin(self.candidates[index]).count("1") <= n]
+
+            for subset in combinations(cells, n):
+                mask = 0
+                for index in subset:
+                    mask |= self.candidates[index]
+
+                if bin(mask).count("1") == n:
+                    if self.__eliminate([index for index in unit if index not in subset], mask):
+                        return True
+
+        return False
+
+    """hidden subsets: n digits of a unit with n possible cells between them fill those cells"""
+    def __hidden_subsets(self, n):
+        for unit in self.units:
+            once = 0
+            for index in unit:
+                once |= self.candidates[index]
+
+            for subset in combinations(self.__digits(once), n):
+                mask = 0
+                for num in subset:
+                    mask |= 1 << num
+
+                cells = [index for index in unit if self.candidates[index] & mask]
+                if len(cells) == n:
+                    if self.__eliminate(cells, self.full_mask & ~mask):
+                        return True
+
+        return False
+
+    """
+    x-wing: a digit with 2 possible cells in each of 2 rows, in the same 2 columns, fills one cell
+    in each of those columns, so it can't be anywhere else in them. The same holds with rows and
+    columns swapped.
+    """
+    def __x_wing(self):
+        for num in range(1, self.size + 1):
+            bit = 1 << num
+
+            # base rows with cover columns, then base columns with cover rows
+            for base, cover in ((0, 1), (1, 0)):
+                lines = {}
+                for unit in self.units[base * self.size:(base + 1) * self.size]:
+                    cells = [index for index in unit if self.candidates[index] & bit]
+                    if len(cells) == 2:
+                        covers = tuple(self.units_of[index][cover] for index in cells)
+
+                        # a second base line with the same two cover lines
+                        if covers in lines:
+                            wing = lines[covers] + cells
+                            others = [index for line in covers for index in self.units[line] if index not in wing]
+                            if self.__eliminate(others, bit):
+                                return True
+                        else:
+                            lines[covers] = cells
+
+        return False
+
+    """
+    xy-chain: a chain of cells with 2 candidates each, each cell sharing a unit and a digit with the
+    next. If the first cell isn't x then every cell in the chain is forced, and the last cell is x.
+    Either end is x, so no cell seeing both ends can be x. Chains are at most length cells long.
+    """
+    def __xy_chain(self, length):
+        pairs = [index for index in range(self.size * self.size) if bin(self.candidates[index]).count("1") == 2]
+        pair_set = set(pairs)
+
+        for start in pairs:
+            for x in self.__digits(self.candidates[start]):
+                # the start cell isn't x, so it holds its other digit
+                forced = self.candidates[start] & ~(1 << x)
+                queue = deque([(start, forced, 1)])
+                seen = {(start, forced)}
+
+                while queue:
+                    index, value, cells = queue.popleft()
+                    if cells == length:
+                        continue
+
+                    # a peer with 2 candidates sharing the forced digit holds its other digit
+                    for peer in self.peers[index]:
+                        if peer not in pair_set or not self.candidates[peer] & value:
+                            continue
+
+                        next_value = self.candidates[peer] & ~value
+                        if (peer, next_value) in seen:
+                            continue
+                        seen.add((peer, next_value))
+
+                        # the chain ends on x, remove x from the cells seeing both ends
+                        if next_value == 1 << x:
+                            others = set(self.peers[start]) & set(self.peers[peer])
+                            if self.__eliminate(others, next_value):
+                                return True
+
+                        queue.append((peer, next_value, cells + 1))
+
+        return False
@@ -0,0 +1,71 @@
+# import the service to test, run with python -m pytest or python -m unittest
+from sudokuServiceClass import SudokuService
+
+# import libraries for the event loop, the responses and the test cases
+import asyncio, json, unittest
+
+"""
+Tests of requests the service must refuse at once instead of tying up a worker with a search that never ends.
+"""
+class SudokuServiceTest(unittest.TestCase):
+    # 1 twice in row 0, and 1 twice in column 0
+    row_conflict = "11" + "0" * 79
+    column_conflict = "1" + "0" * 71 + "1" + "0" * 8
+
+    """POST a JSON payload to a service listening on a local port, returns (status, response)"""
+    async def post(self, port, route, payload):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(f'POST {route} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n'
+                     .encode("latin-1") + body)
+        await writer.drain()
+
+        response = await reader.read()
+        writer.close()
+
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    """start a single threaded service on a free port, post every request to it and close it"""
+    def post_all(self, requests):
+        async def run():
+            async with SudokuService(workers=0, stock=0) as service:
+                server = await service.start(port=0)
+                port = server.sockets[0].getsockname()[1]
+                return [await asyncio.wait_for(self.post(port, route, payload), 10) for route, payload in requests]
+
+        return asyncio.run(run())
+
+    """a puzzle repeating a digit is refused by /solve and /hint without being searched"""
+    def test_conflicting_puzzle(self):
+        for puzzle in (self.row_conflict, self.column_conflict):
+            for status, response in self.post_all([("/solve", {"puzzle": puzzle}), ("/hint", {"puzzle": puzzle})]):
+                self.assertEqual(status, 400)
+                self.assertIn("repeats a digit", response["error"])
+
+    """a difficulty the board size never reaches is refused, with or without a stock of puzzles"""
+    def test_unreachable_difficulty(self):
+        async def run():
+            async with SudokuService(workers=0, stock=4) as service:
+                await service.start(port=0)
+                answers = [await asyncio.wait_for(service.handle("/generate", payload), 10)
+                           for payload in ({"box_size": 2, "difficulty": "medium"},
+                                           {"box_size": 2, "difficulty": "expert", "seed": 1})]
+                return answers, set(service.refilling)
+
+        answers, refilling = asyncio.run(run())
+        for status, response in answers:
+            self.assertEqual(status, 400)
+        self.assertEqual(refilling, set())
+
+    """a valid puzzle is still solved"""
+    def test_solve(self):
+        puzzle = "530070000600195000098000060800060003400803001700020006060000280000419005000080079"
+        [(status, response)] = self.post_all([("/solve", {"puzzle": puzzle})])
+        self.assertEqual(status, 200)
+        self.assertTrue(response["unique"])
+        self.assertEqual(response["solution"][:9], "534678912")
+
+
+if __name__ == "__main__":
+    unittest.main()
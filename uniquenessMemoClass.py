@@ -0,0 +1,75 @@
+# import Zobrist keys to hash boards
+from zobristHash import zobrist_keys, board_key
+
+# import libraries for the least recently used order and the lock shared by every thread
+from collections import OrderedDict
+import threading
+
+"""
+Bounded memo of uniqueness checks, keyed by a Zobrist hash of a board's clues (see zobristHash).
+  * A board's key changes in O(1) when a clue is removed or put back, so a caller removing clues
+    one at a time keeps the key of its board up to date without hashing it again.
+  * Each entry records whether the board has a single solution.
+  * The capacity most recently used boards are kept, the least recently used is dropped first.
+  * Whether a board is unique only depends on its clues, so a result holds for whoever checks the
+    same board again: the same seed generated twice, or the same puzzle checked by two boards.
+  * Every lookup and update holds a lock, so threads can share a memo (the GUI generating on the
+    main thread while a PuzzleBank worker fills the bank).
+
+Usage:
+    memo = UniquenessMemo()
+    key = memo.key(board)
+    unique = memo.get(key ^ memo.keys(size)[index][clue])
+"""
+class UniquenessMemo():
+    """keep the results of up to capacity boards"""
+    def __init__(self, capacity=1 << 15):
+        self.capacity = capacity
+        self.results = OrderedDict()
+        self.lock = threading.Lock()
+
+        # lookups answered from the memo and lookups that needed a search
+        self.hits = 0
+        self.misses = 0
+
+    """random key of every (cell, digit) of a size * size board, see zobrist_keys"""
+    @staticmethod
+    def keys(size):
+        return zobrist_keys(size)
+
+    """key of a whole board of ints or None"""
+    @staticmethod
+    def key(board):
+        return board_key(board, zobrist_keys(len(board)))
+
+    """True if the board of a key has a single solution, False if not, None if it wasn't recorded or was dropped"""
+    def get(self, key):
+        with self.lock:
+            unique = self.results.get(key)
+            if unique == None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.results.move_to_end(key)
+
+            return unique
+
+    """record whether the board of a key has a single solution"""
+    def put(self, key, unique):
+        with self.lock:
+            self.results[key] = unique
+            self.results.move_to_end(key)
+
+            if len(self.results) > self.capacity:
+                self.results.popitem(last=False)
+
+    """forget every result"""
+    def clear(self):
+        with self.lock:
+            self.results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self.results)
@@ -0,0 +1,39 @@
+"""
+Zobrist hashing of SUDOKU boards, a 64 bit key that is updated in O(1) when a cell changes.
+  * Every (cell, digit) has a random 64 bit key and a board's key is the XOR of the keys of its
+    digits, an empty cell adding nothing. Changing a cell XORs out the old digit's key and XORs in
+    the new one, so a board edited one cell at a time never needs to be hashed again.
+  * The keys are seeded by the board size, so every process gives a board the same key.
+  * Two different boards share a key with a chance of 1 in 2^64, about n * n / 2^65 among n boards.
+
+Usage:
+    keys = zobrist_keys(9)
+    key = board_key(board, keys)
+    key ^= keys[index][old] ^ keys[index][new]
+"""
+
+# import random to draw the keys
+import random
+
+# keys of every board size drawn so far
+_tables = {}
+
+
+"""random key of every (cell, digit) of a size * size board as keys[index][digit], digit 0 keys to 0"""
+def zobrist_keys(size):
+    if size not in _tables:
+        generator = random.Random(size)
+        _tables[size] = [[0] + [generator.getrandbits(64) for _ in range(size)] for _ in range(size * size)]
+
+    return _tables[size]
+
+
+"""key of a whole board of ints or None, indexed [row][column]"""
+def board_key(board, keys):
+    size = len(board)
+    key = 0
+    for i in range(size):
+        for j in range(size):
+            key ^= keys[i * size + j][board[i][j] or 0]
+
+    return key